@@ -1,21 +1,275 @@
+import asyncio
+import json
+import time
 from typing import Any
 
 import aiohttp
+from multidict import CIMultiDictProxy
+
+from auth import build_authenticated_headers
+from cache import TTLCache
+from config import (
+    API_URL,
+    CONNECTION_LIMIT,
+    DNS_CACHE_SECONDS,
+    KEEPALIVE_SECONDS,
+    MAX_THROTTLE_RETRIES,
+    ORDER_BOOK_MAX_ENTRIES,
+    ORDER_BOOK_MAX_ORDERS,
+    ORDER_BOOK_STALE_SECONDS,
+    ORDER_BOOK_TTL_SECONDS,
+    OWN_LISTINGS_MAX_AGE_SECONDS,
+    REQUEST_TIMEOUT_SECONDS,
+    USER_AGENT,
+)
+from items import ItemCatalog
+from listing import (
+    Listing,
+    build_item_listing,
+    build_seller_listing,
+    build_user_listing,
+)
+from metrics import RequestMetrics, endpoint_name
+from mirror import ListingMirror
+from orderbook import LiveOrderBooks
+from ratelimit import RateLimiter, parse_retry_after
+
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class WFMClient:
+    """warframe.market API client sharing one tuned connection pool."""
+
+    def __init__(self) -> None:
+        self.session: aiohttp.ClientSession | None = None
+        self.public_headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            **USER_AGENT,
+        }
+        self.authenticated_headers: dict[str, str] = {}
+        self.rate_limiter = RateLimiter()
+        self.order_books = TTLCache(
+            ORDER_BOOK_TTL_SECONDS,
+            ORDER_BOOK_STALE_SECONDS,
+            ORDER_BOOK_MAX_ENTRIES,
+            ORDER_BOOK_MAX_ORDERS,
+        )
+        self.own_listings = ListingMirror(OWN_LISTINGS_MAX_AGE_SECONDS)
+        self.live_books = LiveOrderBooks(
+            ORDER_BOOK_TTL_SECONDS, ORDER_BOOK_STALE_SECONDS
+        )
+        self.in_flight: dict[tuple[str, bool], asyncio.Future] = {}
+        self.coalesced_count = 0
+        self.request_count = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.metrics = RequestMetrics()
+
+    async def __aenter__(self) -> "WFMClient":
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_request_end.append(self._on_request_end)
+        trace_config.on_connection_create_start.append(self._on_connection_create_start)
+        trace_config.on_dns_resolvehost_start.append(self._on_dns_resolvehost_start)
+        trace_config.on_dns_resolvehost_end.append(self._on_dns_resolvehost_end)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            ttl_dns_cache=DNS_CACHE_SECONDS,
+            keepalive_timeout=KEEPALIVE_SECONDS,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS),
+            trace_configs=[trace_config],
+        )
+
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        assert self.session is not None
+        self.order_books.close()
+        self.live_books.close()
+        await self.session.close()
+
+    def set_cookies(self, cookie_header: dict[str, str]) -> None:
+        """Rebuild the authenticated header set for new cookies."""
+        self.authenticated_headers = {
+            **build_authenticated_headers(cookie_header),
+            "Accept-Encoding": ACCEPT_ENCODING,
+        }
+
+    # ================================= TRACING ==================================
+
+    # Each request passes a timings dict as its trace_request_ctx
+
+    async def _on_request_start(self, session, context, params) -> None:
+        self.request_count += 1
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx["start"] = time.perf_counter()
+
+    async def _on_request_end(self, session, context, params) -> None:
+        timings = context.trace_request_ctx
+        if timings is not None:
+            timings["ttfb_ms"] = (time.perf_counter() - timings["start"]) * 1000
+
+    async def _on_connection_create_start(self, session, context, params) -> None:
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx["connect_start"] = time.perf_counter()
+
+    async def _on_dns_resolvehost_start(self, session, context, params) -> None:
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx["dns_start"] = time.perf_counter()
+
+    async def _on_dns_resolvehost_end(self, session, context, params) -> None:
+        timings = context.trace_request_ctx
+        if timings is not None:
+            # Not called on DNS cache hits
+            timings["dns_ms"] = (time.perf_counter() - timings["dns_start"]) * 1000
+
+    async def _on_connection_create_end(self, session, context, params) -> None:
+        self.connections_created += 1
+        timings = context.trace_request_ctx
+        if timings is not None:
+            # TCP and TLS for a new pooled connection, the lookup is timed apart
+            timings["connect_ms"] = (
+                time.perf_counter() - timings["connect_start"]
+            ) * 1000 - timings.get("dns_ms", 0.0)
+
+    async def _on_connection_reuseconn(self, session, context, params) -> None:
+        self.connections_reused += 1
+
+    # ================================= REQUESTS =================================
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        payload: dict[str, Any] | None = None,
+    ) -> tuple[int, CIMultiDictProxy[str], Any]:
+        """Send a rate limited request and return its status, headers and body.
+
+        Throttled requests are retried after the server's Retry-After. Timings
+        of the final attempt are recorded in metrics under the request's endpoint.
+        """
+        assert self.session is not None
+        endpoint = endpoint_name(method, path)
+        retries = 0
+        while True:
+            await self.rate_limiter.acquire()
+            timings: dict[str, float] = {}
+            async with self.session.request(
+                method,
+                f"{API_URL}{path}",
+                headers=headers,
+                json=payload,
+                trace_request_ctx=timings,
+            ) as r:
+                if r.status == 429 and retries < MAX_THROTTLE_RETRIES:
+                    retries += 1
+                    self.rate_limiter.on_throttled(
+                        parse_retry_after(r.headers.get("Retry-After"))
+                    )
+                    continue
+
+                if r.status == 304:
+                    self.rate_limiter.on_success()
+                    self._record(endpoint, timings, time.perf_counter(), 0, None)
+                    return (r.status, r.headers, None)
+
+                if r.status >= 400:
+                    self.metrics.record_error(endpoint)
+                r.raise_for_status()
+                body = await r.read()
+                self.rate_limiter.on_success()
+
+            received = time.perf_counter()
+            data = json.loads(body) if body else None
+            self._record(
+                endpoint,
+                timings,
+                received,
+                len(body),
+                (time.perf_counter() - received) * 1000,
+            )
+
+            return (r.status, r.headers, data)
+
+    def _record(
+        self,
+        endpoint: str,
+        timings: dict[str, float],
+        received: float,
+        size: int,
+        decode_ms: float | None,
+    ) -> None:
+        self.metrics.record(
+            endpoint,
+            dns_ms=timings.get("dns_ms"),
+            connect_ms=timings.get("connect_ms"),
+            ttfb_ms=timings.get("ttfb_ms"),
+            total_ms=(received - timings["start"]) * 1000,
+            decode_ms=decode_ms,
+            bytes=size,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Request metrics and client counters, as shown by the stats command."""
+        return {
+            "requests": self.request_count,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "coalesced": self.coalesced_count,
+            "throttled": self.rate_limiter.throttled_count,
+            "rate_limit": self.rate_limiter.rate,
+            "order_book_cache": {
+                "hits": self.order_books.hits,
+                "stale_hits": self.order_books.stale_hits,
+                "misses": self.order_books.misses,
+                "evictions": self.order_books.evictions,
+            },
+            "live_books": {
+                "watched": len(self.live_books.books),
+                "live": self.live_books.is_live(),
+                "events_applied": self.live_books.events_applied,
+            },
+            "endpoints": self.metrics.to_dict(),
+        }
+
+    async def _get(self, path: str, authenticated: bool = False) -> Any:
+        """GET a resource, sharing one request between concurrent identical calls."""
+        key = (path, authenticated)
+        request = self.in_flight.get(key)
+
+        if request is None:
+            headers = (
+                self.authenticated_headers if authenticated else self.public_headers
+            )
+            request = asyncio.ensure_future(self._request("GET", path, headers))
+            self.in_flight[key] = request
+            request.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        else:
+            self.coalesced_count += 1
 
-from config import USER_AGENT
+        # Shielded so one caller giving up doesn't cancel the request for the others
+        _, _, data = await asyncio.shield(request)
 
-# =================================== METADATA ===================================
+        return data["data"]
 
+    # ================================= METADATA =================================
 
-async def get_user_info(
-    session: aiohttp.ClientSession, headers: dict[str, str]
-) -> dict[str, Any]:
-    """Get the authenticated users profile info."""
-    async with session.get(
-        url="https://api.warframe.market/v2/me", headers=headers
-    ) as r:
-        r.raise_for_status()
-        data = (await r.json())["data"]
+    async def get_user_info(self) -> dict[str, Any]:
+        """Get the authenticated users profile info."""
+        data = await self._get("/me", authenticated=True)
 
         return {
             "ingameName": data.get("ingameName", "Unknown"),
@@ -25,204 +279,182 @@ async def get_user_info(
             "crossplay": data.get("crossplay", False),
         }
 
+    async def get_items_version(self) -> str | None:
+        """Get the current version of the item collection."""
+        data = await self._get("/versions")
 
-async def get_all_items(session: aiohttp.ClientSession) -> list[dict[str, Any]]:
-    """Extract all raw item data."""
-    async with session.get(
-        url="https://api.warframe.market/v2/items", headers=USER_AGENT
-    ) as r:
-        r.raise_for_status()
-
-        return (await r.json())["data"]
-
-
-# =============================== DATA EXTRACTION ================================
-
-
-async def extract_user_listings(
-    session: aiohttp.ClientSession, user: str, id_to_name: dict[str, str], headers
-) -> list[dict[str, Any]]:
-    """Extract and process listings for a specific user."""
-    async with session.get(
-        url=f"https://api.warframe.market/v2/orders/user/{user}",
-        headers=headers,
-    ) as r:
-        r.raise_for_status()
-        response_data = await r.json()
-
-    user_listings = []
-    for listing in response_data["data"]:
-        if listing["type"] == "sell":
-            user_listings.append(
-                {
-                    "id": listing.get("id", ""),
-                    "item": id_to_name[listing.get("itemId", "")],
-                    "itemId": listing.get("itemId", ""),
-                    "price": listing.get("platinum", 0),
-                    "rank": listing.get("rank"),
-                    "quantity": listing.get("quantity", 1),
-                    "visible": listing.get("visible", False),
-                    "updated": listing.get("updatedAt", ""),
-                }
-            )
+        return data.get("collections", {}).get("items")
+
+    async def get_all_items(
+        self, etag: str | None = None, last_modified: str | None = None
+    ) -> tuple[list[dict[str, Any]] | None, dict[str, str]]:
+        """Extract all raw item data, or None if unchanged since the given validators."""
+        headers = dict(self.public_headers)
 
-    return user_listings
-
-
-async def extract_item_listings(
-    session: aiohttp.ClientSession, item: str, id_to_name: dict[str, str]
-) -> list[dict[str, Any]]:
-    """Extract and process listings for a specific item."""
-    async with session.get(
-        url=f"https://api.warframe.market/v2/orders/item/{item}",
-        headers=USER_AGENT,
-    ) as r:
-        r.raise_for_status()
-        response_data = await r.json()
-
-    item_listings = []
-    for listing in response_data["data"]:
-        if listing["type"] == "sell":
-            item_listings.append(
-                {
-                    "seller": listing.get("user", {}).get("ingameName", "Unknown"),
-                    "slug": listing.get("user", {}).get("slug", "Unknown"),
-                    "reputation": listing.get("user", {}).get("reputation", 0),
-                    "status": listing.get("user", {}).get("status", "offline"),
-                    "item": id_to_name[listing.get("itemId", "")],
-                    "itemId": listing.get("itemId", ""),
-                    "rank": listing.get("rank"),
-                    "price": listing.get("platinum", 0),
-                    "quantity": listing.get("quantity", 1),
-                    "updated": listing.get("updatedAt", ""),
-                }
+        if etag is not None:
+            headers["If-None-Match"] = etag
+
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+
+        status, response_headers, data = await self._request("GET", "/items", headers)
+        if status == 304:
+            return (None, {})
+
+        validators = {
+            key: response_headers[header]
+            for key, header in (("etag", "ETag"), ("lastModified", "Last-Modified"))
+            if header in response_headers
+        }
+
+        return (data["data"], validators)
+
+    # ============================= DATA EXTRACTION ==============================
+
+    async def extract_user_listings(
+        self, user: str, catalog: ItemCatalog
+    ) -> list[Listing]:
+        """Extract and process listings for a specific user."""
+        response_data = await self._get(f"/orders/user/{user}", authenticated=True)
+
+        return [
+            build_user_listing(listing, catalog)
+            for listing in response_data
+            if listing["type"] == "sell"
+        ]
+
+    async def get_user_listings(
+        self, user: str, catalog: ItemCatalog, refresh: bool = False
+    ) -> list[Listing]:
+        """The user's own listings, served from the local mirror when it's current."""
+        if refresh or self.own_listings.is_stale():
+            self.own_listings.replace(
+                await self.extract_user_listings(user, catalog), catalog
             )
 
-    return item_listings
-
-
-async def extract_seller_listings(
-    session: aiohttp.ClientSession, slug: str, seller: str, id_to_name: dict[str, str]
-) -> list[dict[str, Any]]:
-    """Extract and process listings for a specific user."""
-    async with session.get(
-        url=f"https://api.warframe.market/v2/orders/user/{slug}",
-        headers=USER_AGENT,
-    ) as r:
-        r.raise_for_status()
-        response_data = await r.json()
-
-    user_listings = []
-    for listing in response_data["data"]:
-        if listing["type"] == "sell":
-            user_listings.append(
-                {
-                    "seller": seller,
-                    "item": id_to_name[listing.get("itemId", "")],
-                    "itemId": listing.get("itemId", ""),
-                    "price": listing.get("platinum", 0),
-                    "rank": listing.get("rank"),
-                    "quantity": listing.get("quantity", 1),
-                    "updated": listing.get("updatedAt", ""),
-                }
+        return self.own_listings.snapshot()
+
+    async def extract_item_listings(
+        self, item: str, catalog: ItemCatalog
+    ) -> list[Listing]:
+        """Extract and process listings for a specific item."""
+        response_data = await self._get(f"/orders/item/{item}")
+
+        return [
+            build_item_listing(listing, catalog)
+            for listing in response_data
+            if listing["type"] == "sell"
+        ]
+
+    async def get_item_listings(self, item: str, catalog: ItemCatalog) -> list[Listing]:
+        """Listings for a specific item, from its live order book if watched.
+
+        Unwatched items, or watched ones while order events can't be received,
+        are served from the order book cache.
+        """
+        if self.live_books.is_watched(item) and await self.live_books.subscribe():
+            return await self.live_books.get(
+                item, lambda: self._get(f"/orders/item/{item}")
             )
 
-    return user_listings
-
-
-# ============================== LISTING MANAGEMENT ==============================
-
-
-async def add_listing(
-    session: aiohttp.ClientSession,
-    headers: dict[str, str],
-    item_id: str,
-    price: int,
-    quantity: int,
-    rank: int | None = None,
-    per_trade: int | None = None,
-) -> None:
-    payload = {
-        "itemId": item_id,
-        "platinum": price,
-        "quantity": quantity,
-        "type": "sell",
-        "visible": True,
-    }
-
-    if rank is not None:
-        payload["rank"] = rank
-
-    if per_trade is not None:
-        payload["perTrade"] = per_trade
-
-    async with session.post(
-        "https://api.warframe.market/v2/order", json=payload, headers=headers
-    ) as r:
-        r.raise_for_status()
-
-
-async def change_visibility(
-    session: aiohttp.ClientSession,
-    listing_id: str,
-    visibility: bool,
-    headers: dict[str, str],
-) -> None:
-    async with session.patch(
-        url=f"https://api.warframe.market/v2/order/{listing_id}",
-        json={"visible": visibility},
-        headers=headers,
-    ) as r:
-        r.raise_for_status()
-
-
-async def change_all_visibility(
-    session: aiohttp.ClientSession, visibility: bool, headers: dict[str, str]
-) -> None:
-    async with session.patch(
-        url="https://api.warframe.market/v2/orders/group/all",
-        json={"type": "sell", "visible": visibility},
-        headers=headers,
-    ) as r:
-        r.raise_for_status()
-
-
-async def delete_listing(
-    session: aiohttp.ClientSession, listing_id: str, headers: dict[str, str]
-) -> None:
-    async with session.delete(
-        url=f"https://api.warframe.market/v2/order/{listing_id}",
-        headers=headers,
-    ) as r:
-        r.raise_for_status()
-
-
-async def edit_listing(
-    session: aiohttp.ClientSession,
-    headers: dict[str, str],
-    listing_id: str,
-    price: int,
-    quantity: int,
-    visible: bool,
-    rank: int | None = None,
-    per_trade: int | None = None,
-) -> None:
-    payload = {
-        "platinum": price,
-        "quantity": quantity,
-        "rank": rank,
-        "visible": visible,
-    }
-
-    if rank is not None:
-        payload["rank"] = rank
-
-    if per_trade is not None:
-        payload["perTrade"] = per_trade
-
-    async with session.patch(
-        url=f"https://api.warframe.market/v2/order/{listing_id}",
-        headers=headers,
-        json=payload,
-    ) as r:
-        r.raise_for_status()
+        return await self.order_books.get(
+            item, lambda: self.extract_item_listings(item, catalog)
+        )
+
+    async def watch_item(self, item: str, item_id: str, catalog: ItemCatalog) -> None:
+        """Start or resync the live order book for an item from a REST snapshot."""
+        self.live_books.watch(
+            item, item_id, await self._get(f"/orders/item/{item}"), catalog
+        )
+
+    async def extract_seller_listings(
+        self, slug: str, seller: str, catalog: ItemCatalog
+    ) -> list[Listing]:
+        """Extract and process listings for a specific user."""
+        response_data = await self._get(f"/orders/user/{slug}")
+
+        return [
+            build_seller_listing(listing, catalog, seller)
+            for listing in response_data
+            if listing["type"] == "sell"
+        ]
+
+    # ============================ LISTING MANAGEMENT ============================
+
+    async def add_listing(
+        self,
+        item_id: str,
+        price: int,
+        quantity: int,
+        rank: int | None = None,
+        per_trade: int | None = None,
+    ) -> None:
+        payload = {
+            "itemId": item_id,
+            "platinum": price,
+            "quantity": quantity,
+            "type": "sell",
+            "visible": True,
+        }
+
+        if rank is not None:
+            payload["rank"] = rank
+
+        if per_trade is not None:
+            payload["perTrade"] = per_trade
+
+        _, _, data = await self._request(
+            "POST", "/order", self.authenticated_headers, payload
+        )
+        self.own_listings.apply_order(data and data.get("data"))
+
+    async def change_visibility(self, listing_id: str, visibility: bool) -> None:
+        _, _, data = await self._request(
+            "PATCH",
+            f"/order/{listing_id}",
+            self.authenticated_headers,
+            {"visible": visibility},
+        )
+        self.own_listings.apply_order(data and data.get("data"))
+
+    async def change_all_visibility(self, visibility: bool) -> None:
+        await self._request(
+            "PATCH",
+            "/orders/group/all",
+            self.authenticated_headers,
+            {"type": "sell", "visible": visibility},
+        )
+        self.own_listings.set_all_visible(visibility)
+
+    async def delete_listing(self, listing_id: str) -> None:
+        await self._request(
+            "DELETE", f"/order/{listing_id}", self.authenticated_headers
+        )
+        self.own_listings.remove(listing_id)
+
+    async def edit_listing(
+        self,
+        listing_id: str,
+        price: int,
+        quantity: int,
+        visible: bool,
+        rank: int | None = None,
+        per_trade: int | None = None,
+    ) -> None:
+        payload = {
+            "platinum": price,
+            "quantity": quantity,
+            "rank": rank,
+            "visible": visible,
+        }
+
+        if rank is not None:
+            payload["rank"] = rank
+
+        if per_trade is not None:
+            payload["perTrade"] = per_trade
+
+        _, _, data = await self._request(
+            "PATCH", f"/order/{listing_id}", self.authenticated_headers, payload
+        )
+        self.own_listings.apply_order(data and data.get("data"))
@@ -0,0 +1,65 @@
+"""Benchmark parallel EE.log backfill against a single-process sync read.
+
+Run from the repository root with: python -m benchmarks.bench_backfill
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_trade_parser import TRADE_EVERY, write_log
+from commands import _parse_logs, _read_trades
+from trades import TradeParser
+
+
+def worker_counts(cpus: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--trade-every", type=int, default=TRADE_EVERY)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    log_path = Path(tempfile.mkdtemp(prefix="wfm-bench-")) / "EE.log"
+    print(f"Writing {args.size_mb:,} MB log to {log_path}", file=sys.stderr)
+    write_log(log_path, args.size_mb, args.trade_every)
+    size_mb = log_path.stat().st_size / 1024 / 1024
+
+    try:
+        start = time.perf_counter()
+        expected = _read_trades(log_path, {"last_byte_offset": 0}, TradeParser())
+        sequential = time.perf_counter() - start
+        print(
+            f"sequential           {sequential:8.2f}s  {size_mb / sequential:8.1f} MB/s"
+        )
+
+        for workers in worker_counts(args.workers):
+            start = time.perf_counter()
+            (trades,) = asyncio.run(_parse_logs([log_path], workers))
+            seconds = time.perf_counter() - start
+            assert trades == expected, "Backfill disagrees with the sequential read"
+            print(
+                f"{workers:2} workers           {seconds:8.2f}s  "
+                f"{size_mb / seconds:8.1f} MB/s  {sequential / seconds:5.2f}x"
+            )
+    finally:
+        log_path.unlink()
+
+    print(f"{len(expected):,} trades in {size_mb:,.0f} MB on {os.cpu_count()} cores")
+
+
+if __name__ == "__main__":
+    main()
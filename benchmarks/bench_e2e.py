@@ -0,0 +1,256 @@
+"""End-to-end load benchmark driving wfm headlessly against the local mock server.
+
+Run from the repository root with: python -m benchmarks.bench_e2e
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shlex
+import socket
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmarks.mock_server import MockConfig, start_server
+
+
+class ScriptedSession:
+    """PromptSession stand-in that replays commands and timestamps each prompt."""
+
+    def __init__(self, commands: list[str], **kwargs: Any) -> None:
+        self.commands = iter(commands)
+        self.prompted_at: list[float] = []
+        self.returned_at: list[float] = []
+
+    async def prompt_async(self, *args: Any, **kwargs: Any) -> str:
+        self.prompted_at.append(time.perf_counter())
+        command = next(self.commands, "exit")
+        self.returned_at.append(time.perf_counter())
+
+        return command
+
+
+async def run_script(commands: list[str]) -> tuple[float, ScriptedSession]:
+    """Run wfm over a command script and return its start time and session."""
+    import wfm
+
+    sessions = []
+
+    def make_session(**kwargs: Any) -> ScriptedSession:
+        session = ScriptedSession(commands, **kwargs)
+        sessions.append(session)
+        return session
+
+    wfm.PromptSession = make_session
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        await wfm.wfm()
+
+    return (started, sessions[0])
+
+
+def _item_names(items: list[dict[str, Any]], count: int, seed: int) -> list[str]:
+    return [
+        item["i18n"]["en"]["name"] for item in random.Random(seed).sample(items, count)
+    ]
+
+
+def percentiles(timings: list[float]) -> dict[str, float]:
+    if len(timings) < 2:
+        return {"p50": timings[0], "p95": timings[0], "p99": timings[0]}
+
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+def command_timings(session: ScriptedSession) -> list[float]:
+    """Milliseconds between each command being entered and the next prompt."""
+    return [
+        (prompted - returned) * 1000
+        for returned, prompted in zip(session.returned_at, session.prompted_at[1:])
+    ]
+
+
+# ================================= SCENARIOS ====================================
+
+
+async def bench_startup(config: MockConfig, port: int) -> dict[str, float]:
+    """Time to first prompt without and then with an on-disk catalog cache."""
+    runner, _ = await start_server(config, port=port)
+    try:
+        results = {}
+        for label in ["cold_ms", "warm_ms"]:
+            started, session = await run_script([])
+            results[label] = (session.prompted_at[0] - started) * 1000
+    finally:
+        await runner.cleanup()
+
+    return results
+
+
+async def bench_search(
+    config: MockConfig, port: int, search_count: int
+) -> dict[str, dict[str, float]]:
+    """Search latency for order books fetched from the server and from cache."""
+    runner, _ = await start_server(config, port=port)
+    try:
+        state = runner.app["state"]
+        names = _item_names(state.items, search_count, config.seed)
+        commands = [f"search {shlex.quote(name)}" for name in names]
+        _, session = await run_script(commands + commands)
+    finally:
+        await runner.cleanup()
+
+    timings = command_timings(session)
+
+    return {
+        "miss": percentiles(timings[:search_count]),
+        "hit": percentiles(timings[search_count:]),
+        "order_book_requests": state.order_book_requests,
+    }
+
+
+async def bench_watched_search(
+    config: MockConfig, port: int, search_count: int, watch_count: int
+) -> dict[str, Any]:
+    """Search latency for watched items, answered from live order books."""
+    runner, _ = await start_server(config, port=port)
+    try:
+        state = runner.app["state"]
+        names = _item_names(state.items, watch_count, config.seed)
+        watches = [f"watch {shlex.quote(name)}" for name in names]
+        searches = [
+            f"search {shlex.quote(names[i % watch_count])}" for i in range(search_count)
+        ]
+        _, session = await run_script(watches + searches)
+    finally:
+        await runner.cleanup()
+
+    return {
+        **percentiles(command_timings(session)[watch_count:]),
+        "order_book_requests": state.order_book_requests,
+    }
+
+
+async def bench_bump(config: MockConfig, port: int) -> dict[str, float]:
+    """Throughput of 'bump all' over every own listing."""
+    runner, _ = await start_server(config, port=port)
+    try:
+        state = runner.app["state"]
+        _, session = await run_script(["bump all"])
+    finally:
+        await runner.cleanup()
+
+    seconds = command_timings(session)[0] / 1000
+
+    return {
+        "listings": len(state.own_orders),
+        "seconds": seconds,
+        "listings_per_second": len(state.own_orders) / seconds,
+        "throttled": state.throttled_count,
+    }
+
+
+async def run_benchmarks(args: argparse.Namespace, port: int) -> dict[str, Any]:
+    config = MockConfig(
+        latency=args.latency,
+        orders_per_item=args.orders_per_item,
+        own_listings=args.own_listings,
+    )
+    events_config = MockConfig(
+        latency=args.latency,
+        orders_per_item=args.orders_per_item,
+        order_events=args.order_events,
+    )
+    throttled_config = MockConfig(
+        latency=args.latency,
+        orders_per_item=args.orders_per_item,
+        own_listings=args.own_listings,
+        rate_limit=args.server_rate_limit,
+        retry_after=0.5,
+    )
+
+    return {
+        "startup": await bench_startup(config, port),
+        "search": await bench_search(config, port, args.searches),
+        "watched_search": await bench_watched_search(
+            events_config, port, args.searches * 2, args.watched
+        ),
+        "bump": await bench_bump(config, port),
+        "bump_throttled": await bench_bump(throttled_config, port),
+    }
+
+
+def report(results: dict[str, Any]) -> None:
+    startup = results["startup"]
+    print(f"startup (cold)       {startup['cold_ms']:9.1f}ms")
+    print(f"startup (warm)       {startup['warm_ms']:9.1f}ms")
+
+    search = results["search"]
+    watched = results["watched_search"]
+    for label, timings in [
+        ("miss", search["miss"]),
+        ("hit", search["hit"]),
+        ("watched", watched),
+    ]:
+        print(
+            f"search ({label})".ljust(21)
+            + "".join(f"{key} {timings[key]:8.2f}ms  " for key in ["p50", "p95", "p99"])
+        )
+    print(
+        f"order book requests  {search['order_book_requests']} unwatched, "
+        f"{watched['order_book_requests']} watched"
+    )
+
+    for label in ["bump", "bump_throttled"]:
+        bump = results[label]
+        print(
+            f"{label.replace('_', ' ')}".ljust(21)
+            + f"{bump['listings']} listings in {bump['seconds']:.2f}s "
+            f"({bump['listings_per_second']:.1f}/s, {bump['throttled']} throttled)"
+        )
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--searches", type=int, default=50)
+    parser.add_argument("--orders-per-item", type=int, default=200)
+    parser.add_argument("--own-listings", type=int, default=60)
+    parser.add_argument("--watched", type=int, default=10)
+    parser.add_argument("--order-events", type=float, default=50.0)
+    parser.add_argument("--server-rate-limit", type=float, default=4.0)
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    # The config module reads these at import, so they're set before wfm loads
+    port = _free_port()
+    app_dir = Path(tempfile.mkdtemp(prefix="wfm-bench-"))
+    (app_dir / "cookies.json").write_text(json.dumps({"JWT": "bench"}))
+    os.environ["WFM_APP_DIR"] = str(app_dir)
+    os.environ["WFM_API_URL"] = f"http://127.0.0.1:{port}/v2"
+    os.environ["WFM_WS_URI"] = f"ws://127.0.0.1:{port}/socket"
+
+    results = asyncio.run(run_benchmarks(args, port))
+    report(results)
+
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark the preparation phase of the links command.
+
+Run from the repository root with: python -m benchmarks.bench_links
+"""
+
+import statistics
+import time
+
+from benchmarks.synthetic import generate_catalog, generate_user_listings
+from commands import (
+    _chunk_links,
+    _convert_items_to_links,
+    _expand_item_sets,
+    _filter_unlinkable_items,
+)
+from display import DEFAULT_ORDERS
+from filters import sort_listings
+from items import ItemCatalog, get_base_name
+from listing import Listing
+
+LISTING_COUNT = 300
+RUNS = 200
+TARGET_MS = 10.0
+
+
+def _expand_item_sets_by_scan(
+    user_listings: list[Listing], catalog: ItemCatalog
+) -> list[str]:
+    """Set expansion that rescans the catalog per set, as before the index."""
+    expanded_items = []
+
+    for listing in user_listings:
+        if listing.item.endswith(" Set"):
+            set_base = get_base_name(listing.item)
+            for item in catalog:
+                if get_base_name(item.name) == set_base and item.name != listing.item:
+                    expanded_items.append(item.name)
+        else:
+            expanded_items.append(listing.item)
+
+    return expanded_items
+
+
+def prepare_links(user_listings, catalog, expand) -> list[str]:
+    sorted_user_listings, _ = sort_listings(user_listings, "item", None, DEFAULT_ORDERS)
+    expanded_items = expand(sorted_user_listings, catalog)
+    filtered_items = _filter_unlinkable_items(expanded_items)
+    return _chunk_links(_convert_items_to_links(filtered_items))
+
+
+def measure(user_listings, catalog, expand, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        prepare_links(list(user_listings), catalog, expand)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def main() -> None:
+    catalog = generate_catalog()
+    user_listings = generate_user_listings(catalog, LISTING_COUNT)
+    set_count = sum(listing.item.endswith(" Set") for listing in user_listings)
+
+    assert prepare_links(
+        list(user_listings), catalog, _expand_item_sets
+    ) == prepare_links(list(user_listings), catalog, _expand_item_sets_by_scan)
+
+    print(
+        f"links prep: {LISTING_COUNT} listings ({set_count} sets), "
+        f"{len(catalog)} catalog items"
+    )
+    for label, expand, runs in (
+        ("indexed", _expand_item_sets, RUNS),
+        ("catalog scan", _expand_item_sets_by_scan, max(RUNS // 20, 5)),
+    ):
+        timings = measure(user_listings, catalog, expand, runs)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        print(
+            f"  {label:<13} median {statistics.median(timings):8.3f} ms  "
+            f"p95 {p95:8.3f} ms"
+        )
+
+    median = statistics.median(measure(user_listings, catalog, _expand_item_sets, RUNS))
+    print(f"  target < {TARGET_MS} ms: {'ok' if median < TARGET_MS else 'FAILED'}")
+
+
+if __name__ == "__main__":
+    main()
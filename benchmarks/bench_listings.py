@@ -0,0 +1,136 @@
+"""Benchmark building item listings from a popular item's order book.
+
+Run from the repository root with: python -m benchmarks.bench_listings
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from benchmarks.synthetic import generate_catalog, generate_raw_orders
+from items import ItemCatalog
+from listing import build_item_listing
+
+ORDER_COUNT = 5000
+RUNS = 50
+TARGET_MEMORY_RATIO = 0.5  # Listings should retain at most half of the dicts
+
+# ================================== LEGACY ======================================
+
+
+def legacy_item_listing(
+    listing: dict[str, Any], catalog: ItemCatalog
+) -> dict[str, Any]:
+    """Dict shape used for other sellers' listings before the Listing type."""
+    user = listing.get("user", {})
+
+    return {
+        "seller": user.get("ingameName", "Unknown"),
+        "slug": user.get("slug", "Unknown"),
+        "reputation": user.get("reputation", 0),
+        "status": user.get("status", "offline"),
+        "item": catalog[listing.get("itemId", "")].name,
+        "itemId": listing.get("itemId", ""),
+        "rank": listing.get("rank"),
+        "price": listing.get("platinum", 0),
+        "quantity": listing.get("quantity", 1),
+        "updated": listing.get("updatedAt", ""),
+    }
+
+
+# ================================== RUNNING =====================================
+
+Builder = Callable[[dict[str, Any], ItemCatalog], Any]
+
+
+def build(orders: list[dict[str, Any]], catalog: ItemCatalog, builder: Builder):
+    return [builder(order, catalog) for order in orders if order["type"] == "sell"]
+
+
+def measure_time(
+    body: bytes, catalog: ItemCatalog, builder: Builder, runs: int
+) -> tuple[float, float]:
+    """Median milliseconds to build every listing, alone and with decoding the body."""
+    orders = json.loads(body)["data"]
+    build_timings = []
+    total_timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        build(orders, catalog, builder)
+        build_timings.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        build(json.loads(body)["data"], catalog, builder)
+        total_timings.append((time.perf_counter() - start) * 1000)
+
+    return (statistics.median(build_timings), statistics.median(total_timings))
+
+
+def measure_memory(
+    orders: list[dict[str, Any]], catalog: ItemCatalog, builder: Builder
+) -> tuple[int, int]:
+    """Bytes retained by the built listings, and the peak while building them."""
+    gc.collect()
+    tracemalloc.start()
+    listings = build(orders, catalog, builder)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del listings
+
+    return (retained, peak)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=ORDER_COUNT)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    catalog = generate_catalog()
+    orders = generate_raw_orders(catalog, args.orders)
+    body = json.dumps({"data": orders}).encode()
+    assert [legacy_item_listing(order, catalog) for order in orders] == [
+        {
+            "seller": listing.seller,
+            "slug": listing.slug,
+            "reputation": listing.reputation,
+            "status": listing.status,
+            "item": listing.item,
+            "itemId": listing.item_id,
+            "rank": listing.rank,
+            "price": listing.price,
+            "quantity": listing.quantity,
+            "updated": listing.updated,
+        }
+        for listing in build(orders, catalog, build_item_listing)
+    ], "Listing builder disagrees with the legacy dict builder"
+
+    results = {}
+    for label, builder in [
+        ("dict", legacy_item_listing),
+        ("Listing", build_item_listing),
+    ]:
+        build_ms, total_ms = measure_time(body, catalog, builder, args.runs)
+        retained, peak = measure_memory(orders, catalog, builder)
+        results[label] = retained
+        print(
+            f"{label:8} {build_ms:7.2f} ms build  {total_ms:7.2f} ms with decoding  "
+            f"{retained / args.orders:5.0f} B/listing retained  "
+            f"{peak / 1024:9.0f} KiB peak"
+        )
+
+    ratio = results["Listing"] / results["dict"]
+    print(f"memory   {ratio:.2f}x of dict ({args.orders:,} orders)")
+    if ratio > TARGET_MEMORY_RATIO:
+        print(f"Above the {TARGET_MEMORY_RATIO:.2f}x target", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
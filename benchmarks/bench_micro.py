@@ -0,0 +1,230 @@
+"""Micro-benchmarks for the pure hot paths, compared against a JSON baseline.
+
+Run from the repository root with: python -m benchmarks.bench_micro
+Record a new baseline with --save after an intentional performance change.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import (
+    generate_catalog,
+    generate_item_listings,
+    generate_log_lines,
+    generate_user_listings,
+)
+from display import (
+    DEFAULT_ORDERS,
+    RIGHT_ALLIGNED_COLUMNS,
+    build_listings_rows,
+    build_search_rows,
+    build_seller_rows,
+    determine_widths,
+    display_listings,
+)
+from filters import filter_listings, sort_listings
+from listing import Listing
+from parsers import (
+    parse_add_args,
+    parse_bump_args,
+    parse_edit_args,
+    parse_listings_args,
+    parse_search_args,
+    parse_seller_args,
+)
+from trades import TradeParser
+
+BASELINE_FILE = Path(__file__).parent / "baselines" / "micro.json"
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+MIN_SECONDS = 0.2  # Repeat each case until at least this much time is measured
+MAX_RUNS = 50
+TOLERANCE = 1.5  # Slowdown against the baseline reported as a regression
+
+CATALOG = generate_catalog()
+
+# ================================== FIXTURES ====================================
+
+
+def _own_listings(size: int) -> list[Listing]:
+    """Own listings cycled to size, as the catalog caps unique items."""
+    listings = generate_user_listings(CATALOG, min(size, 2000))
+    return [listings[i % len(listings)] for i in range(size)]
+
+
+def _args(size: int) -> list[str]:
+    args = ["1"]
+    for i in range(size // 2):
+        args.extend([f"key{i % 8}", str(i)])
+    return args
+
+
+def _log_text(size: int) -> str:
+    return "\n".join(generate_log_lines(CATALOG, size)) + "\n"
+
+
+# Each case builds its input once per size, then the timed call runs on it
+CASES: dict[str, tuple[Callable[[int], Any], Callable[[Any], Any]]] = {
+    "filters.filter_listings": (
+        lambda size: generate_item_listings(CATALOG, size),
+        lambda listings: filter_listings(listings, 0, "ingame"),
+    ),
+    "filters.sort_listings": (
+        lambda size: generate_item_listings(CATALOG, size),
+        lambda listings: sort_listings(list(listings), "price", None, DEFAULT_ORDERS),
+    ),
+    "filters.sort_listings limit=20": (
+        lambda size: generate_item_listings(CATALOG, size),
+        lambda listings: sort_listings(listings, "price", None, DEFAULT_ORDERS, 20),
+    ),
+    "display.build_search_rows": (
+        lambda size: generate_item_listings(CATALOG, size),
+        lambda listings: build_search_rows(listings, CATALOG),
+    ),
+    "display.build_listings_rows": (
+        _own_listings,
+        lambda listings: build_listings_rows(listings, CATALOG),
+    ),
+    "display.build_seller_rows": (
+        _own_listings,
+        lambda listings: build_seller_rows(listings, CATALOG),
+    ),
+    "display.determine_widths": (
+        lambda size: build_search_rows(generate_item_listings(CATALOG, size), CATALOG),
+        lambda rows: determine_widths(rows, "price"),
+    ),
+    "display.display_listings": (
+        lambda size: (
+            rows := build_search_rows(generate_item_listings(CATALOG, size), CATALOG),
+            determine_widths(rows, "price"),
+        ),
+        lambda data: display_listings(
+            data[0], data[1], RIGHT_ALLIGNED_COLUMNS, "price", "asc"
+        ),
+    ),
+    "parsers.parse_search_args": (_args, parse_search_args),
+    "parsers.parse_listings_args": (_args, parse_listings_args),
+    "parsers.parse_add_args": (_args, parse_add_args),
+    "parsers.parse_seller_args": (_args, parse_seller_args),
+    "parsers.parse_edit_args": (_args, parse_edit_args),
+    "parsers.parse_bump_args": (_args, parse_bump_args),
+    "trades.TradeParser.feed": (_log_text, lambda text: TradeParser().feed(text)),
+}
+
+# ================================== RUNNING =====================================
+
+
+def measure(run: Callable[[Any], Any], data: Any) -> float:
+    """Median seconds per call over enough runs to fill MIN_SECONDS."""
+    timings = []
+    while len(timings) < MAX_RUNS and (len(timings) < 3 or sum(timings) < MIN_SECONDS):
+        start = time.perf_counter()
+        run(data)
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def run_cases(names: list[str], sizes: list[int]) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+
+    with open(os.devnull, "w") as devnull:
+        for name in names:
+            setup, run = CASES[name]
+            results[name] = {}
+            for size in sizes:
+                data = setup(size)
+                with contextlib.redirect_stdout(devnull):
+                    results[name][str(size)] = measure(run, data)
+                del data
+                print(
+                    f"{name:34} {size:>9,}  {results[name][str(size)] * 1000:10.3f}ms",
+                    file=sys.stderr,
+                )
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Cases slower than tolerance times their baseline."""
+    regressions = []
+
+    for name, timings in results.items():
+        for size, seconds in timings.items():
+            base = baseline.get(name, {}).get(size)
+            if base is not None and seconds > base * tolerance:
+                regressions.append(
+                    f"{name} @ {int(size):,}: {seconds * 1000:.3f}ms "
+                    f"vs {base * 1000:.3f}ms baseline ({seconds / base:.2f}x)"
+                )
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="Write a new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--max-size", type=int, default=SIZES[-1])
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "-k", dest="pattern", default="", help="Only run matching cases"
+    )
+    args = parser.parse_args()
+
+    names = [name for name in CASES if args.pattern in name]
+    sizes = [size for size in SIZES if size <= args.max_size]
+    results = run_cases(names, sizes)
+
+    if args.save:
+        args.baseline.parent.mkdir(exist_ok=True)
+        previous = (
+            json.loads(args.baseline.read_text())["results"]
+            if args.baseline.exists()
+            else {}
+        )
+        for name, timings in results.items():
+            previous.setdefault(name, {}).update(timings)
+
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "results": previous,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"\nBaseline written to {args.baseline}", file=sys.stderr)
+        return
+
+    if not args.baseline.exists():
+        print("\nNo baseline found, run with --save to record one.", file=sys.stderr)
+        return
+
+    regressions = compare(
+        results, json.loads(args.baseline.read_text())["results"], args.tolerance
+    )
+    if regressions:
+        print("\nRegressions:", *regressions, sep="\n  ", file=sys.stderr)
+        sys.exit(1)
+
+    print("\nNo regressions against the baseline.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
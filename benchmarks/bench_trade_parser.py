@@ -0,0 +1,194 @@
+"""Benchmark EE.log trade parsing throughput on a large synthetic log.
+
+Run from the repository root with: python -m benchmarks.bench_trade_parser
+"""
+
+import argparse
+import re
+import sys
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+from benchmarks.synthetic import generate_catalog, generate_log_lines
+from commands import _read_trades
+from config import LOG_CHUNK_BYTES
+from trades import TradeParser
+
+BLOCK_LINES = 200_000
+TRADE_EVERY = 5000  # Lines per trade dialog, most of a real EE.log is engine noise
+TARGET_SPEEDUP = 5.0
+
+UNICODE_RANK_PATTERN = re.compile(r"[\uE000-\uF8FF]")
+
+# ================================== LEGACY ======================================
+
+
+def _iter_log_lines(log_path: Path, state: dict[str, int]) -> Iterator[str]:
+    """Line reader used by sync before the fused parser."""
+    with log_path.open("rb") as f:
+        f.seek(state["last_byte_offset"])
+        carry = b""
+
+        while chunk := f.read(LOG_CHUNK_BYTES):
+            data = carry + chunk
+            end = data.rfind(b"\n") + 1
+            carry = data[end:]
+            if not end:
+                continue
+
+            yield from data[:end].decode("utf-8", errors="replace").splitlines()
+            state["last_byte_offset"] += end
+
+
+def _extract_trade_chunks(lines: Iterable[str]) -> list[list[str]]:
+    trade_chunks = []
+    current_chunk: list[str] = []
+    recording = False
+
+    for line in lines:
+        if "Are you sure you want to accept this trade?" in line:
+            current_chunk = [line]
+            recording = True
+
+        elif "SendResult_MENU_CANCEL()" in line:
+            current_chunk = []
+            recording = False
+
+        elif "The trade was successful!" in line and recording:
+            current_chunk.append(line)
+            trade_chunks.append(current_chunk)
+            recording = False
+
+        elif recording:
+            current_chunk.append(line)
+
+    return trade_chunks
+
+
+def _parse_trade_items(
+    trade_chunks: list[list[str]],
+) -> list[dict[str, tuple[str, ...]]]:
+    def normalize_item_name(raw_name: str) -> str:
+        name = raw_name.split("(")[0].strip()
+        name = re.sub(UNICODE_RANK_PATTERN, "", name).strip()
+        return name
+
+    parsed_trades = []
+    for chunk in trade_chunks:
+        offered_items = []
+        received_items = []
+        in_offer_section = False
+        in_receive_section = False
+
+        for line in chunk:
+            if "offering" in line:
+                in_offer_section = True
+            elif "receive" in line:
+                in_offer_section = False
+                in_receive_section = True
+            elif "Confirm_Item_Cancel" in line:
+                received_items.append(line.split(",")[0])
+                in_receive_section = False
+            elif in_offer_section:
+                offered_items.append(line)
+            elif in_receive_section:
+                received_items.append(line)
+
+        parsed_trades.append(
+            {
+                "offered": tuple(
+                    normalize_item_name(item) for item in offered_items if item
+                ),
+                "received": tuple(
+                    normalize_item_name(item) for item in received_items if item
+                ),
+            }
+        )
+
+    return parsed_trades
+
+
+def legacy_trades(log_path: Path) -> list[dict[str, tuple[str, ...]]]:
+    state = {"last_byte_offset": 0}
+    return _parse_trade_items(_extract_trade_chunks(_iter_log_lines(log_path, state)))
+
+
+def fused_trades(log_path: Path) -> list[dict[str, tuple[str, ...]]]:
+    trades = _read_trades(log_path, {"last_byte_offset": 0}, TradeParser())
+    return [
+        {"offered": trade["offered"], "received": trade["received"]} for trade in trades
+    ]
+
+
+# ================================== RUNNING =====================================
+
+
+def write_log(path: Path, size_mb: int, trade_every: int) -> int:
+    """Write a synthetic log of about size_mb by repeating one block, returning its line count."""
+    lines = generate_log_lines(generate_catalog(), BLOCK_LINES, trade_every)
+    block = "\n".join(lines) + "\n"
+    encoded = block.encode()
+    repeats = max(1, size_mb * 1024 * 1024 // len(encoded))
+
+    with path.open("wb") as f:
+        for _ in range(repeats):
+            f.write(encoded)
+
+    return repeats * BLOCK_LINES
+
+
+def measure(parse: Any, log_path: Path) -> tuple[float, list[Any]]:
+    start = time.perf_counter()
+    trades = parse(log_path)
+
+    return (time.perf_counter() - start, trades)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--trade-every", type=int, default=TRADE_EVERY)
+    parser.add_argument("--log", type=Path, help="Reuse or keep the log at this path")
+    args = parser.parse_args()
+
+    log_path = args.log or Path(tempfile.mkdtemp(prefix="wfm-bench-")) / "EE.log"
+    if log_path.exists():
+        with log_path.open("rb") as f:
+            line_count = sum(
+                chunk.count(b"\n")
+                for chunk in iter(lambda: f.read(LOG_CHUNK_BYTES), b"")
+            )
+    else:
+        print(f"Writing {args.size_mb:,} MB log to {log_path}", file=sys.stderr)
+        line_count = write_log(log_path, args.size_mb, args.trade_every)
+
+    size_mb = log_path.stat().st_size / 1024 / 1024
+    print(f"log                  {size_mb:,.0f} MB, {line_count:,} lines")
+
+    try:
+        legacy_seconds, expected = measure(legacy_trades, log_path)
+        fused_seconds, trades = measure(fused_trades, log_path)
+    finally:
+        if args.log is None:
+            log_path.unlink()
+
+    assert trades == expected, "Fused parser disagrees with the legacy parser"
+
+    for label, seconds in [("legacy", legacy_seconds), ("fused", fused_seconds)]:
+        print(
+            f"{label:20} {seconds:8.2f}s  {line_count / seconds / 1e6:7.2f}M lines/s  "
+            f"{size_mb / seconds:8.1f} MB/s"
+        )
+
+    speedup = legacy_seconds / fused_seconds
+    print(f"speedup              {speedup:.1f}x ({len(trades):,} trades)")
+    if speedup < TARGET_SPEEDUP:
+        print(f"Below the {TARGET_SPEEDUP:.0f}x target", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""Local stand-in for the warframe.market API and WebSocket, served from fixtures.
+
+Run from the repository root with: python -m benchmarks.mock_server
+Then point wfm at it with WFM_API_URL=http://127.0.0.1:8765/v2 and
+WFM_WS_URI=ws://127.0.0.1:8765/socket.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from aiohttp import WSMsgType, web
+
+from benchmarks.synthetic import generate_raw_items
+
+USER_SLUG = "bench_user"
+ITEMS_VERSION = "bench-1"
+ITEMS_ETAG = '"bench-items-1"'
+STATUSES = ["ingame", "online", "invisible"]
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.0  # Seconds added before every response
+    set_count: int = 600
+    mod_count: int = 1500
+    languages: int = 12
+    orders_per_item: int = 200
+    own_listings: int = 100
+    rate_limit: float | None = None  # Requests per second before 429s, None for off
+    burst: float = 3.0
+    retry_after: float = 1.0
+    order_events: float = 0.0  # New orders pushed to subscribers per second
+    seed: int = 0
+
+
+class MockState:
+    """Fixture data and counters shared by the request handlers."""
+
+    def __init__(self, config: MockConfig) -> None:
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.items = generate_raw_items(
+            config.set_count, config.mod_count, config.languages, config.seed
+        )
+        self.items_body = json.dumps({"data": self.items}).encode()
+        self.items_by_slug = {item["slug"]: item for item in self.items}
+        self.order_books: dict[str, bytes] = {}
+        self.own_orders = {
+            order["id"]: order
+            for order in (
+                self._order(f"{i:024x}", item, own=True)
+                for i, item in enumerate(
+                    self.rng.sample(
+                        self.items, min(config.own_listings, len(self.items))
+                    )
+                )
+            )
+        }
+        self.next_order_id = len(self.own_orders)
+        self.tokens = config.burst
+        self.updated = time.monotonic()
+        self.request_count = 0
+        self.order_book_requests = 0
+        self.throttled_count = 0
+
+    def _order(self, order_id: str, item: dict[str, Any], own: bool) -> dict[str, Any]:
+        user_slug = USER_SLUG if own else f"seller_{self.rng.randrange(10_000)}"
+        order = {
+            "id": order_id,
+            "type": "sell",
+            "platinum": self.rng.randint(1, 500),
+            "quantity": self.rng.randint(1, 10),
+            "visible": True,
+            "itemId": item["id"],
+            "updatedAt": "2026-01-01T00:00:00Z",
+            "user": {
+                "ingameName": user_slug.capitalize(),
+                "slug": user_slug,
+                "reputation": self.rng.randint(0, 200),
+                "status": self.rng.choice(STATUSES),
+            },
+        }
+        if "maxRank" in item:
+            order["rank"] = 0
+
+        return order
+
+    def order_book(self, slug: str) -> bytes:
+        """Encoded order book for an item, generated once per slug."""
+        body = self.order_books.get(slug)
+        if body is None:
+            item = self.items_by_slug[slug]
+            orders = [
+                self._order(f"{slug}-{i}", item, own=False)
+                for i in range(self.config.orders_per_item)
+            ]
+            body = self.order_books[slug] = json.dumps({"data": orders}).encode()
+
+        return body
+
+    def take_token(self) -> bool:
+        """Server-side token bucket, False once the client should be throttled."""
+        if self.config.rate_limit is None:
+            return True
+
+        now = time.monotonic()
+        self.tokens = min(
+            self.config.burst,
+            self.tokens + (now - self.updated) * self.config.rate_limit,
+        )
+        self.updated = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+# ================================== HANDLERS ====================================
+
+
+@web.middleware
+async def mock_middleware(request: web.Request, handler) -> web.StreamResponse:
+    state: MockState = request.app["state"]
+    state.request_count += 1
+
+    if state.config.latency:
+        await asyncio.sleep(state.config.latency)
+
+    if request.path != "/socket" and not state.take_token():
+        state.throttled_count += 1
+        return web.json_response(
+            {"error": "rate limited"},
+            status=429,
+            headers={"Retry-After": str(state.config.retry_after)},
+        )
+
+    return await handler(request)
+
+
+def _json_body(body: bytes, **headers: str) -> web.Response:
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+async def get_versions(request: web.Request) -> web.Response:
+    return web.json_response({"data": {"collections": {"items": ITEMS_VERSION}}})
+
+
+async def get_items(request: web.Request) -> web.Response:
+    if request.headers.get("If-None-Match") == ITEMS_ETAG:
+        return web.Response(status=304)
+
+    return _json_body(request.app["state"].items_body, ETag=ITEMS_ETAG)
+
+
+async def get_me(request: web.Request) -> web.Response:
+    return web.json_response(
+        {
+            "data": {
+                "ingameName": "Bench_user",
+                "slug": USER_SLUG,
+                "reputation": 42,
+                "platform": "pc",
+                "crossplay": True,
+            }
+        }
+    )
+
+
+async def get_item_orders(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    slug = request.match_info["slug"]
+    if slug not in state.items_by_slug:
+        raise web.HTTPNotFound()
+
+    state.order_book_requests += 1
+    return _json_body(state.order_book(slug))
+
+
+async def get_user_orders(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    if request.match_info["slug"] != USER_SLUG:
+        return web.json_response({"data": []})
+
+    return web.json_response({"data": list(state.own_orders.values())})
+
+
+async def post_order(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    payload = await request.json()
+    order = {
+        **payload,
+        "id": f"{state.next_order_id:024x}",
+        "updatedAt": "2026-01-01T00:00:00Z",
+        "user": {
+            "ingameName": "Bench_user",
+            "slug": USER_SLUG,
+            "reputation": 42,
+            "status": "ingame",
+        },
+    }
+    state.next_order_id += 1
+    state.own_orders[order["id"]] = order
+    await broadcast(request.app, "newOrder", order)
+
+    return web.json_response({"data": order})
+
+
+async def patch_order(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    order = state.own_orders.get(request.match_info["order_id"])
+    if order is None:
+        raise web.HTTPNotFound()
+
+    order.update(
+        {
+            key: value
+            for key, value in (await request.json()).items()
+            if value is not None
+        }
+    )
+    order["updatedAt"] = "2026-01-02T00:00:00Z"
+
+    return web.json_response({"data": order})
+
+
+async def patch_all_orders(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    visible = (await request.json()).get("visible", True)
+    for order in state.own_orders.values():
+        order["visible"] = visible
+
+    return web.json_response({"data": None})
+
+
+async def delete_order(request: web.Request) -> web.Response:
+    state: MockState = request.app["state"]
+    order = state.own_orders.pop(request.match_info["order_id"], None)
+    if order is None:
+        raise web.HTTPNotFound()
+
+    return web.json_response({"data": None})
+
+
+async def socket(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    request.app["websockets"].add(ws)
+    status = "invisible"
+
+    async for message in ws:
+        if message.type != WSMsgType.TEXT:
+            continue
+
+        data = json.loads(message.data)
+        route = data.get("route", "")
+
+        reply = {"route": f"{route}:ok", "refId": data.get("id")}
+
+        if route == "@wfm|cmd/subscribe/newOrders":
+            request.app["subscribers"].add(ws)
+            await ws.send_json({**reply, "payload": None})
+        elif route == "@wfm|cmd/auth/signIn":
+            await ws.send_json({**reply, "payload": {"status": status}})
+        elif route == "@wfm|cmd/status/set":
+            status = data.get("payload", {}).get("status", status)
+            await ws.send_json({**reply, "payload": {"status": status}})
+        else:
+            await ws.send_json(
+                {"route": f"{route}:error", "refId": data.get("id"), "payload": None}
+            )
+
+    request.app["websockets"].discard(ws)
+    request.app["subscribers"].discard(ws)
+    return ws
+
+
+async def broadcast(app: web.Application, event: str, order: dict[str, Any]) -> None:
+    """Push an order event to every socket subscribed to order events."""
+    message = {
+        "route": f"@wfm|event/subscriptions/{event}",
+        "payload": {"order": order},
+    }
+    for ws in set(app["subscribers"]):
+        await ws.send_json(message)
+
+
+async def publish_orders(app: web.Application) -> None:
+    """Push random new orders at the configured rate."""
+    state: MockState = app["state"]
+    while True:
+        await asyncio.sleep(1 / state.config.order_events)
+        item = state.rng.choice(state.items)
+        await broadcast(
+            app,
+            "newOrder",
+            state._order(f"event-{state.next_order_id}", item, own=False),
+        )
+        state.next_order_id += 1
+
+
+async def start_publisher(app: web.Application) -> None:
+    if app["state"].config.order_events:
+        app["publisher"] = asyncio.create_task(publish_orders(app))
+
+
+async def stop_publisher(app: web.Application) -> None:
+    if "publisher" in app:
+        app["publisher"].cancel()
+
+
+async def close_websockets(app: web.Application) -> None:
+    """Drop open sockets on shutdown, as a server restart would."""
+    for ws in set(app["websockets"]):
+        await ws.close()
+
+
+# ==================================== APP =======================================
+
+
+def build_app(config: MockConfig) -> web.Application:
+    app = web.Application(middlewares=[mock_middleware])
+    app["state"] = MockState(config)
+    app["websockets"] = set()
+    app["subscribers"] = set()
+    app.on_startup.append(start_publisher)
+    app.on_shutdown.append(stop_publisher)
+    app.on_shutdown.append(close_websockets)
+    app.router.add_get("/v2/versions", get_versions)
+    app.router.add_get("/v2/items", get_items)
+    app.router.add_get("/v2/me", get_me)
+    app.router.add_get("/v2/orders/item/{slug}", get_item_orders)
+    app.router.add_get("/v2/orders/user/{slug}", get_user_orders)
+    app.router.add_post("/v2/order", post_order)
+    app.router.add_patch("/v2/order/{order_id}", patch_order)
+    app.router.add_patch("/v2/orders/group/all", patch_all_orders)
+    app.router.add_delete("/v2/order/{order_id}", delete_order)
+    app.router.add_get("/socket", socket)
+
+    return app
+
+
+async def start_server(
+    config: MockConfig, host: str = "127.0.0.1", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Start the mock in the running loop and return its runner and base URL."""
+    runner = web.AppRunner(build_app(config))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+
+    return (runner, f"http://{host}:{port}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--sets", type=int, default=600)
+    parser.add_argument("--mods", type=int, default=1500)
+    parser.add_argument("--languages", type=int, default=12)
+    parser.add_argument("--orders-per-item", type=int, default=200)
+    parser.add_argument("--own-listings", type=int, default=100)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--order-events", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockConfig(
+        latency=args.latency,
+        set_count=args.sets,
+        mod_count=args.mods,
+        languages=args.languages,
+        orders_per_item=args.orders_per_item,
+        own_listings=args.own_listings,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        order_events=args.order_events,
+    )
+    web.run_app(build_app(config), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import random
+from typing import Any
+
+from items import ItemCatalog
+from listing import Listing
+
+WARFRAME_PARTS = ["Blueprint", "Neuroptics", "Chassis", "Systems"]
+WEAPON_PARTS = ["Blueprint", "Barrel", "Receiver", "Stock"]
+LANGUAGES = [
+    "en",
+    "ru",
+    "ko",
+    "de",
+    "fr",
+    "pt",
+    "zh-hans",
+    "zh-hant",
+    "es",
+    "it",
+    "pl",
+    "uk",
+]
+SYLLABLES = ["ra", "ven", "tor", "ka", "li", "mo", "zen", "dra", "ul", "ex", "sa"]
+
+# =================================== CATALOG ====================================
+
+
+def _base_names(rng: random.Random, count: int) -> list[str]:
+    names = set()
+    while len(names) < count:
+        word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        names.add(word.capitalize())
+
+    return sorted(names)
+
+
+def _item_rows(set_count: int, mod_count: int, seed: int) -> list[list[Any]]:
+    """Prime sets with their parts plus standalone ranked mods, as catalog rows."""
+    rng = random.Random(seed)
+    rows = []
+
+    for i, base in enumerate(_base_names(rng, set_count + mod_count)):
+        if i < set_count:
+            parts = WARFRAME_PARTS if i % 2 else WEAPON_PARTS
+            for suffix in ["Set", *parts]:
+                name = f"{base} Prime {suffix}"
+                tags = ["prime", "set" if suffix == "Set" else "component"]
+                rows.append(
+                    [f"{len(rows):024x}", name, name.lower(), tags, False, None]
+                )
+        else:
+            name = f"{base} Mod"
+            rows.append([f"{len(rows):024x}", name, name.lower(), ["mod"], False, 10])
+
+    return rows
+
+
+def generate_catalog(
+    set_count: int = 600, mod_count: int = 1500, seed: int = 0
+) -> ItemCatalog:
+    return ItemCatalog.from_rows(_item_rows(set_count, mod_count, seed))
+
+
+def generate_raw_items(
+    set_count: int = 600, mod_count: int = 1500, languages: int = 12, seed: int = 0
+) -> list[dict[str, Any]]:
+    """Items shaped like the /v2/items payload, with i18n in several languages."""
+    raw_items = []
+
+    for item_id, name, slug, tags, bulk_tradable, max_rank in _item_rows(
+        set_count, mod_count, seed
+    ):
+        slug = slug.replace(" ", "_")
+        raw_item = {
+            "id": item_id,
+            "slug": slug,
+            "gameRef": f"/Lotus/Types/Items/{slug}",
+            "tags": tags,
+            "bulkTradable": bulk_tradable,
+            "i18n": {
+                language: {
+                    "name": name,
+                    "icon": f"items/images/{language}/{slug}.png",
+                    "thumb": f"items/images/{language}/{slug}.thumb.png",
+                }
+                for language in LANGUAGES[:languages]
+            },
+        }
+        if max_rank is not None:
+            raw_item["maxRank"] = max_rank
+        raw_items.append(raw_item)
+
+    return raw_items
+
+
+# =================================== LISTINGS ===================================
+
+
+def generate_user_listings(
+    catalog: ItemCatalog, count: int, seed: int = 0
+) -> list[Listing]:
+    """Own listings like api.extract_user_listings output."""
+    rng = random.Random(seed)
+    listings = []
+
+    for i, item in enumerate(rng.sample(catalog.items, count)):
+        listings.append(
+            Listing(
+                item=item.name,
+                item_id=item.id,
+                price=rng.randint(1, 500),
+                rank=0 if item.max_rank is not None else None,
+                quantity=rng.randint(1, 10),
+                visible=rng.random() < 0.9,
+                updated=f"2026-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}T00:00:00Z",
+                id=f"{i:024x}",
+            )
+        )
+
+    return listings
+
+
+def generate_item_listings(
+    catalog: ItemCatalog, count: int, seed: int = 0
+) -> list[Listing]:
+    """Other sellers' listings like api.extract_item_listings output."""
+    rng = random.Random(seed)
+    items = catalog.items
+    sellers = [f"Seller{i}" for i in range(min(count, 5000))]
+    timestamps = _timestamps(rng)
+    statuses = ["ingame", "online", "offline"]
+    listings = []
+
+    for _ in range(count):
+        item = rng.choice(items)
+        seller = rng.choice(sellers)
+        listings.append(
+            Listing(
+                seller=seller,
+                slug=seller.lower(),
+                reputation=rng.randint(0, 500),
+                status=rng.choice(statuses),
+                item=item.name,
+                item_id=item.id,
+                rank=rng.randint(0, item.max_rank)
+                if item.max_rank is not None
+                else None,
+                price=rng.randint(1, 500),
+                quantity=rng.randint(1, 10),
+                updated=rng.choice(timestamps),
+            )
+        )
+
+    return listings
+
+
+def generate_raw_orders(
+    catalog: ItemCatalog, count: int, seed: int = 0
+) -> list[dict[str, Any]]:
+    """Sell orders shaped like the /orders/item response, for one popular item."""
+    rng = random.Random(seed)
+    item = rng.choice([item for item in catalog.items if item.max_rank is not None])
+    timestamps = _timestamps(rng)
+    statuses = ["ingame", "online", "offline"]
+    orders = []
+
+    for i in range(count):
+        seller = f"Seller{rng.randrange(5000)}"
+        orders.append(
+            {
+                "id": f"{i:024x}",
+                "type": "sell",
+                "platinum": rng.randint(1, 500),
+                "quantity": rng.randint(1, 10),
+                "rank": rng.randint(0, item.max_rank),
+                "visible": True,
+                "itemId": item.id,
+                "createdAt": rng.choice(timestamps),
+                "updatedAt": rng.choice(timestamps),
+                "user": {
+                    "id": f"{rng.randrange(1 << 96):024x}",
+                    "ingameName": seller,
+                    "slug": seller.lower(),
+                    "reputation": rng.randint(0, 500),
+                    "platform": "pc",
+                    "crossplay": True,
+                    "locale": "en",
+                    "status": rng.choice(statuses),
+                    "activity": {"type": "UNKNOWN", "details": "unknown"},
+                    "lastSeen": rng.choice(timestamps),
+                },
+            }
+        )
+
+    return orders
+
+
+def _timestamps(rng: random.Random) -> list[str]:
+    return [
+        f"2026-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}T"
+        f"{rng.randint(0, 23):02}:{rng.randint(0, 59):02}:00Z"
+        for _ in range(1000)
+    ]
+
+
+# ==================================== EE.LOG ====================================
+
+LOG_NOISE = [
+    "Sys [Info]: Created /Lotus/Interface/HUD.swf",
+    "Net [Info]: Replication count by concrete type:",
+    "Script [Info]: ThemedSquadOverlay.lua: Mission vote data",
+    "Game [Info]: Loading /Lotus/Levels/Hub/Relay.level",
+    "Sys [Info]: Streamed 1842 KB in 0.031s",
+]
+
+
+def generate_log_lines(
+    catalog: ItemCatalog, count: int, trade_every: int = 50, seed: int = 0
+) -> list[str]:
+    """EE.log lines with a trade dialog, some cancelled, roughly every trade_every lines."""
+    rng = random.Random(seed)
+    items = catalog.items
+    lines = []
+    clock = 0.0
+
+    while len(lines) < count:
+        clock += rng.random()
+        if rng.randrange(trade_every) == 0:
+            offered = [rng.choice(items).name for _ in range(rng.randint(1, 3))]
+            lines.extend(
+                [
+                    f"{clock:.3f} Script [Info]: Dialog.lua: Dialog::CreateOkCancel("
+                    "description=Are you sure you want to accept this trade? "
+                    "You are offering",
+                    *offered,
+                    f"and will receive from Buyer{rng.randrange(1000)} the following:",
+                    f"Platinum x {rng.randint(1, 500)}",
+                    ", leftItem=/Menu/Confirm_Item_Ok, rightItem=/Menu/Confirm_Item_Cancel)",
+                ]
+            )
+            if rng.random() < 0.1:
+                lines.append(
+                    f"{clock:.3f} Script [Info]: TradeManager.lua: SendResult_MENU_CANCEL()"
+                )
+            else:
+                lines.append(
+                    f"{clock:.3f} Script [Info]: Dialog.lua: Dialog::CreateOk("
+                    "description=The trade was successful!, leftItem=/Menu/Confirm_Item_Ok)"
+                )
+        else:
+            lines.append(f"{clock:.3f} {rng.choice(LOG_NOISE)}")
+
+    return lines[:count]
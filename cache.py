@@ -0,0 +1,91 @@
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Sized
+
+import aiohttp
+
+
+class TTLCache:
+    """LRU cache of sized values with stale-while-revalidate refreshes.
+
+    Entries younger than ttl are served as-is. Entries younger than stale_ttl are
+    served immediately while a background task fetches a replacement. Least
+    recently used entries are evicted once either the entry count or the total
+    size of the cached values exceeds its bound.
+    """
+
+    def __init__(
+        self, ttl: float, stale_ttl: float, max_entries: int, max_size: int
+    ) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.entries: OrderedDict[Hashable, tuple[Sized, float]] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._refreshes: dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Sized]]) -> Sized:
+        """Cached value for key, fetching it on a miss."""
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+
+            if age < self.ttl:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return value
+
+            if age < self.stale_ttl:
+                self.stale_hits += 1
+                self.entries.move_to_end(key)
+                if key not in self._refreshes:
+                    self._refreshes[key] = asyncio.create_task(
+                        self._refresh(key, fetch)
+                    )
+                return value
+
+        self.misses += 1
+        value = await fetch()
+        self.put(key, value)
+
+        return value
+
+    def put(self, key: Hashable, value: Sized) -> None:
+        self.invalidate(key)
+        self.entries[key] = (value, time.monotonic())
+        self.size += len(value)
+
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries or self.size > self.max_size
+        ):
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def close(self) -> None:
+        """Cancel any background refreshes still running."""
+        for task in self._refreshes.values():
+            task.cancel()
+
+    async def _refresh(
+        self, key: Hashable, fetch: Callable[[], Awaitable[Sized]]
+    ) -> None:
+        try:
+            self.put(key, await fetch())
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass  # Keep serving the stale value until it expires
+        finally:
+            del self._refreshes[key]
@@ -0,0 +1,117 @@
+import asyncio
+import json
+import time
+from typing import Any
+
+import aiohttp
+
+from api import WFMClient
+from config import CATALOG_CACHE_FILE, CATALOG_FRESH_SECONDS, CATALOG_MAX_AGE_SECONDS
+from items import ItemCatalog
+
+CATALOG_CACHE_VERSION = 2
+
+# ================================== CACHE FILE ==================================
+
+
+def load_catalog_cache() -> dict[str, Any] | None:
+    """Load the cached item catalog, ignoring missing, corrupt or outdated caches."""
+    try:
+        with CATALOG_CACHE_FILE.open() as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if cache.get("version") != CATALOG_CACHE_VERSION:
+        return None
+
+    cache["catalog"] = ItemCatalog.from_rows(cache.pop("items"))
+
+    return cache
+
+
+def save_catalog_cache(cache: dict[str, Any]) -> None:
+    """Atomically write the item catalog cache."""
+    data = {key: value for key, value in cache.items() if key != "catalog"}
+    data["items"] = cache["catalog"].to_rows()
+
+    tmp_file = CATALOG_CACHE_FILE.with_suffix(".tmp")
+    with tmp_file.open("w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    tmp_file.replace(CATALOG_CACHE_FILE)
+
+
+def catalog_age(cache: dict[str, Any]) -> float:
+    """Seconds since the catalog was last fetched or revalidated."""
+    return time.time() - cache["fetchedAt"]
+
+
+# ================================= REVALIDATION =================================
+
+
+async def fetch_catalog(
+    client: WFMClient, cache: dict[str, Any] | None = None
+) -> tuple[dict[str, Any], bool]:
+    """Fetch the item catalog, revalidating against the cached copy if given."""
+    try:
+        items_version = await client.get_items_version()
+    except (aiohttp.ClientError, KeyError, ValueError):
+        items_version = None  # Fall back to conditional requests
+
+    if cache is not None:
+        if items_version is not None and items_version == cache.get("itemsVersion"):
+            items = None
+        else:
+            items, validators = await client.get_all_items(
+                cache.get("etag"), cache.get("lastModified")
+            )
+
+        if items is None:
+            cache["fetchedAt"] = time.time()
+            save_catalog_cache(cache)
+            return (cache, False)
+    else:
+        items, validators = await client.get_all_items()
+        assert items is not None
+
+    cache = {
+        "version": CATALOG_CACHE_VERSION,
+        "fetchedAt": time.time(),
+        "itemsVersion": items_version,
+        **validators,
+        "catalog": ItemCatalog.from_raw(items),
+    }
+    save_catalog_cache(cache)
+
+    return (cache, True)
+
+
+async def load_catalog(
+    client: WFMClient,
+) -> tuple[dict[str, Any], asyncio.Task | None]:
+    """Load the item catalog according to the staleness policy.
+
+    Fresh caches are used as-is, stale caches are used immediately and revalidated
+    by the returned background task, and expired or missing caches are fetched
+    before returning.
+    """
+    cache = load_catalog_cache()
+
+    if cache is None:
+        cache, _ = await fetch_catalog(client)
+        return (cache, None)
+
+    age = catalog_age(cache)
+
+    if age < CATALOG_FRESH_SECONDS:
+        return (cache, None)
+
+    if age < CATALOG_MAX_AGE_SECONDS:
+        return (cache, asyncio.create_task(fetch_catalog(client, cache)))
+
+    try:
+        cache, _ = await fetch_catalog(client, cache)
+    except aiohttp.ClientError:
+        pass  # An expired catalog beats no catalog
+
+    return (cache, None)
@@ -1,23 +1,34 @@
 import asyncio
+import functools
 import json
-import re
+import multiprocessing
+import os
 import subprocess
 import sys
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import aiohttp
 import pyperclip
 from prompt_toolkit import PromptSession
-
-from api import (
-    delete_listing,
-    edit_listing,
-    extract_item_listings,
-    extract_seller_listings,
-    extract_user_listings,
+from prompt_toolkit.application import run_in_terminal
+from prompt_toolkit.patch_stdout import patch_stdout
+
+from api import WFMClient
+from config import (
+    BACKFILL_SPLIT_BYTES,
+    BACKFILL_WORKERS,
+    BUMP_CONCURRENCY,
+    LOG_CHUNK_BYTES,
+    LOG_HEADER_BYTES,
+    LOG_POLL_SECONDS,
+    SALES_DAYS,
+    SYNC_CONCURRENCY,
+    SYNC_JOURNAL_FILE,
+    SYNC_STATE_FILE,
 )
-from config import SYNC_STATE_FILE
 from display import (
     DEFAULT_ORDERS,
     RIGHT_ALLIGNED_COLUMNS,
@@ -25,40 +36,17 @@ from display import (
     build_search_rows,
     build_seller_rows,
     determine_widths,
+    display_daily_sales,
     display_listings,
+    display_sales,
+    display_watched,
 )
 from filters import filter_listings, sort_listings
-
-PART_SUFFIXES = [
-    "Set",
-    "Blueprint",
-    "Barrel",
-    "Receiver",
-    "Casing",
-    "Pod",
-    "Weapon Pod",
-    "Engine",
-    "Stock",
-    "Neuroptics",
-    "Chassis",
-    "Systems",
-    "Gauntlet",
-    "Link",
-    "Buckle",
-    "Carapace",
-    "Cerebrum",
-    "Band",
-    "Wings",
-    "Pouch",
-    "Stars",
-    "Harness",
-    "Grip",
-    "Blade",
-    "Lower Limb",
-    "Handle",
-    "Upper Limb",
-    "String",
-]
+from items import Item, ItemCatalog
+from journal import SyncJournal, write_atomic
+from ledger import TradeLedger, trade_platinum
+from listing import Listing
+from trades import TradeParser, parse_log_range, parse_session_start, split_log
 
 UNLINKABLE_ITEMS = {
     "Primed Chamber",
@@ -81,25 +69,35 @@ UNLINKABLE_ITEMS = {
     "Baro Void-Signal (Key)",
 }
 
-UNICODE_RANK_PATTERN = re.compile(r"[\uE000-\uF8FF]")
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+# Held while reading the log and applying trades, so follow mode and a manual
+# sync never apply the same delta twice
+SYNC_LOCK = asyncio.Lock()
+SYNC_JOURNAL = SyncJournal(SYNC_JOURNAL_FILE)
 
 # ===================================== COPY =====================================
 
 
-def copy(listing_to_copy: dict[str, Any], max_ranks: dict[str, int | None]) -> str:
+def copy(listing_to_copy: Listing, catalog: ItemCatalog) -> str:
     """Copy a listing for in-game whispering."""
-    item_id = listing_to_copy["itemId"]
-    item_name = listing_to_copy["item"]
+    item_id = listing_to_copy.item_id
+    item_name = listing_to_copy.item
 
-    if listing_to_copy.get("rank") is not None:
-        item_name = f"{item_name} (rank {listing_to_copy['rank']}/{max_ranks[item_id]})"
+    if listing_to_copy.rank is not None:
+        item_name = (
+            f"{item_name} (rank {listing_to_copy.rank}/{catalog[item_id].max_rank})"
+        )
 
     segments = [
         "WTB",
         item_name,
-        f"{listing_to_copy['price']}p",
+        f"{listing_to_copy.price}p",
     ]
-    message = f"/w {listing_to_copy['seller']} {' | '.join(segments)}"
+    message = f"/w {listing_to_copy.seller} {' | '.join(segments)}"
 
     pyperclip.copy(message)
 
@@ -111,24 +109,25 @@ def copy(listing_to_copy: dict[str, Any], max_ranks: dict[str, int | None]) -> s
 
 async def search(
     item_slug: str,
-    id_to_name: dict[str, str],
-    max_ranks: dict[str, int | None],
-    session: aiohttp.ClientSession,
+    catalog: ItemCatalog,
+    client: WFMClient,
     rank: int | None = None,
     sort: str = "price",
     order: str | None = None,
     status: str = "ingame",
-) -> tuple[bool, str | None, list[dict[str, Any]]]:
-    item_listings = await extract_item_listings(session, item_slug, id_to_name)
+    limit: int | None = None,
+) -> tuple[bool, str | None, list[Listing]]:
+    item_listings = await client.get_item_listings(item_slug, catalog)
     if not item_listings:
         return (False, "No listings available.", [])
-    filtered_item_listings = filter_listings(item_listings, rank, status)
+    # Copy so sorting never reorders the cached order book
+    filtered_item_listings = filter_listings(list(item_listings), rank, status)
     if not filtered_item_listings:
         return (False, "No listings match specified filters.", [])
     sorted_item_listings, sort_order = sort_listings(
-        filtered_item_listings, sort, order, DEFAULT_ORDERS
+        filtered_item_listings, sort, order, DEFAULT_ORDERS, limit
     )
-    data_rows = build_search_rows(sorted_item_listings, max_ranks)
+    data_rows = build_search_rows(sorted_item_listings, catalog)
     column_widths = determine_widths(data_rows, sort)
     display_listings(data_rows, column_widths, RIGHT_ALLIGNED_COLUMNS, sort, sort_order)
 
@@ -139,25 +138,29 @@ async def search(
 
 
 async def listings(
-    id_to_name: dict[str, str],
-    max_ranks: dict[str, int | None],
+    catalog: ItemCatalog,
     user: str,
-    headers: dict[str, str],
-    session: aiohttp.ClientSession,
+    client: WFMClient,
+    refresh: bool = False,
     rank: int | None = None,
     sort: str = "updated",
     order: str | None = None,
-) -> tuple[bool, str | None, list[dict[str, Any]]]:
-    user_listings = await extract_user_listings(session, user, id_to_name, headers)
+    limit: int | None = None,
+) -> tuple[bool, str | None, list[Listing]]:
+    user_listings = await client.get_user_listings(user, catalog, refresh)
     if not user_listings:
         return (False, "No listings available.", [])
     filtered_user_listings = filter_listings(user_listings, rank, status="all")
     if not filtered_user_listings:
         return (False, "No listings match specified filters.", [])
     sorted_user_listings, sort_order = sort_listings(
-        filtered_user_listings, sort, order, {**DEFAULT_ORDERS, "price": "desc"}
+        filtered_user_listings,
+        sort,
+        order,
+        {**DEFAULT_ORDERS, "price": "desc"},
+        limit,
     )
-    data_rows = build_listings_rows(sorted_user_listings, max_ranks)
+    data_rows = build_listings_rows(sorted_user_listings, catalog)
     column_widths = determine_widths(data_rows, sort)
     display_listings(data_rows, column_widths, RIGHT_ALLIGNED_COLUMNS, sort, sort_order)
 
@@ -168,59 +171,140 @@ async def listings(
 
 
 async def seller(
-    id_to_name: dict[str, str],
-    max_ranks: dict[str, int | None],
+    catalog: ItemCatalog,
     slug: str,
     seller: str,
-    session: aiohttp.ClientSession,
+    client: WFMClient,
     rank: int | None = None,
     sort: str = "updated",
     order: str | None = None,
-) -> tuple[bool, str | None, list[dict[str, Any]]]:
-    seller_listings = await extract_seller_listings(session, slug, seller, id_to_name)
+    limit: int | None = None,
+) -> tuple[bool, str | None, list[Listing]]:
+    seller_listings = await client.extract_seller_listings(slug, seller, catalog)
     if not seller_listings:
         return (False, "No listings available.", [])
     filtered_seller_listings = filter_listings(seller_listings, rank, status="all")
     if not filtered_seller_listings:
         return (False, "No listings match specified filters.", [])
     sorted_seller_listings, sort_order = sort_listings(
-        filtered_seller_listings, sort, order, DEFAULT_ORDERS
+        filtered_seller_listings, sort, order, DEFAULT_ORDERS, limit
     )
-    data_rows = build_seller_rows(sorted_seller_listings, max_ranks)
+    data_rows = build_seller_rows(sorted_seller_listings, catalog)
     column_widths = determine_widths(data_rows, sort)
     display_listings(data_rows, column_widths, RIGHT_ALLIGNED_COLUMNS, sort, sort_order)
 
     return (True, None, sorted_seller_listings)
 
 
-# ==================================== LINKS =====================================
+# ==================================== WATCH =====================================
+
+
+async def watch(
+    item: Item | None, catalog: ItemCatalog, client: WFMClient
+) -> tuple[bool, str | None]:
+    """Keep a live order book for an item, or list watched items if none given."""
+    live_books = client.live_books
+
+    if item is None:
+        if not live_books.books:
+            return (False, "No items watched.")
+        display_watched(live_books, catalog)
+        return (True, None)
 
+    if live_books.is_watched(item.slug):
+        return (False, f"Already watching {item.name}.")
 
-def _get_base_name(item_name: str) -> str:
-    """Extract base name without part suffixes."""
-    words = item_name.split()
-    while words and words[-1] in PART_SUFFIXES:
-        words.pop()
+    if not await live_books.subscribe():
+        return (False, "WebSocket not connected, can't watch items.")
+
+    await client.watch_item(item.slug, item.id, catalog)
+    print(
+        f"\nWatching {item.name} ({len(live_books.books[item.slug].orders)} listings).\n"
+    )
+
+    return (True, None)
+
+
+def unwatch(item: Item, client: WFMClient) -> tuple[bool, str | None]:
+    if not client.live_books.is_watched(item.slug):
+        return (False, f"Not watching {item.name}.")
+
+    client.live_books.unwatch(item.slug)
+    print(f"\nStopped watching {item.name}.\n")
+
+    return (True, None)
 
-    return " ".join(words)
+
+# ===================================== BUMP =====================================
+
+
+BUMP_FIELDS = ["price", "quantity", "rank", "visible"]
+
+
+async def _bump_listing(client: WFMClient, listing: Listing) -> None:
+    kwargs = {
+        field: getattr(listing, field)
+        for field in BUMP_FIELDS
+        if getattr(listing, field) is not None
+    }
+
+    await client.edit_listing(listing.id, **kwargs)
+
+
+async def bump_all(
+    catalog: ItemCatalog,
+    user: str,
+    client: WFMClient,
+    concurrency: int = BUMP_CONCURRENCY,
+) -> tuple[bool, str | None]:
+    """Bump every listing, oldest first, with several bumps in flight at once."""
+    # Bumps write back every field, so start from what the site has now
+    user_listings = await client.get_user_listings(user, catalog, refresh=True)
+    if not user_listings:
+        return (False, "No listings available.")
+    sorted_listings, _ = sort_listings(user_listings, "updated", "asc", DEFAULT_ORDERS)
+
+    total = len(sorted_listings)
+    pending = iter(sorted_listings)  # Shared so bumps start in oldest-first order
+    completed = 0
+    failed = []
+
+    async def worker() -> None:
+        nonlocal completed
+        for listing in pending:
+            try:
+                await _bump_listing(client, listing)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                completed += 1
+                failed.append(listing)
+                print(
+                    f"[{completed}/{total}] Failed to bump {listing.item} listing ({e})."
+                )
+            else:
+                completed += 1
+                print(f"[{completed}/{total}] Bumped {listing.item} listing.")
+
+    print(f"\nBumping {total} listings...\n")
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+
+    if failed:
+        return (False, f"Failed to bump {len(failed)} of {total} listings.")
+
+    return (True, None)
+
+
+# ==================================== LINKS =====================================
 
 
-def _expand_item_sets(
-    user_listings: list[dict[str, Any]], all_items: list[dict[str, Any]]
-) -> list[str]:
+def _expand_item_sets(user_listings: list[Listing], catalog: ItemCatalog) -> list[str]:
     """Expand set items into individual parts for the set."""
     expanded_items = []
 
     for listing in user_listings:
-        if listing["item"].endswith(" Set"):
-            set_base = _get_base_name(listing["item"])
-            for item in all_items:
-                item_name = item["i18n"]["en"]["name"]
-                item_base = _get_base_name(item_name)
-                if set_base == item_base and item_name != listing["item"]:
-                    expanded_items.append(item_name)
+        if listing.item.endswith(" Set"):
+            expanded_items.extend(catalog.set_parts(listing.item))
         else:
-            expanded_items.append(listing["item"])
+            expanded_items.append(listing.item)
 
     return expanded_items
 
@@ -281,20 +365,18 @@ async def _copy_to_clipboard(chunks: list[str], prompt_session: PromptSession) -
 
 
 async def links(
-    all_items: list[dict[str, Any]],
-    id_to_name: dict[str, str],
+    catalog: ItemCatalog,
     user: str,
-    headers: dict[str, str],
-    session: aiohttp.ClientSession,
+    client: WFMClient,
     prompt_session: PromptSession,
     sort: str = "item",
     order: str | None = None,
 ) -> tuple[bool, str | None]:
-    user_listings = await extract_user_listings(session, user, id_to_name, headers)
+    user_listings = await client.get_user_listings(user, catalog)
     if not user_listings:
         return (False, "No listings available.")
     sorted_user_listings, _ = sort_listings(user_listings, sort, order, DEFAULT_ORDERS)
-    expanded_items = _expand_item_sets(sorted_user_listings, all_items)
+    expanded_items = _expand_item_sets(sorted_user_listings, catalog)
     filtered_items = _filter_unlinkable_items(expanded_items)
     links = _convert_items_to_links(filtered_items)
     link_chunks = _chunk_links(links)
@@ -307,6 +389,7 @@ async def links(
 # ===================================== SYNC =====================================
 
 
+@functools.cache  # Resolving the WSL user spawns whoami.exe
 def _get_log_path() -> Path:
     if sys.platform == "win32":
         return Path.home() / "AppData/Local/Warframe/EE.log"
@@ -336,74 +419,6 @@ def _get_log_path() -> Path:
         raise RuntimeError(f"\nUnsupported platform: {sys.platform}\n")
 
 
-def _extract_trade_chunks(lines: list[str]) -> list[list[str]]:
-    trade_chunks = []
-    current_chunk = []
-    recording = False
-
-    for line in lines:
-        if "Are you sure you want to accept this trade?" in line:
-            current_chunk = [line]
-            recording = True
-
-        elif "SendResult_MENU_CANCEL()" in line:
-            current_chunk = []
-            recording = False
-
-        elif "The trade was successful!" in line and recording:
-            current_chunk.append(line)
-            trade_chunks.append(current_chunk)
-            recording = False
-
-        elif recording:
-            current_chunk.append(line)
-
-    return trade_chunks
-
-
-def _parse_trade_items(
-    trade_chunks: list[list[str]],
-) -> list[dict[str, tuple[str, ...]]]:
-    def normalize_item_name(raw_name: str) -> str:
-        name = raw_name.split("(")[0].strip()
-        name = re.sub(UNICODE_RANK_PATTERN, "", name).strip()
-        return name
-
-    parsed_trades = []
-    for chunk in trade_chunks:
-        offered_items = []
-        received_items = []
-        in_offer_section = False
-        in_receive_section = False
-
-        for line in chunk:
-            if "offering" in line:
-                in_offer_section = True
-            elif "receive" in line:
-                in_offer_section = False
-                in_receive_section = True
-            elif "Confirm_Item_Cancel" in line:
-                received_items.append(line.split(",")[0])
-                in_receive_section = False
-            elif in_offer_section:
-                offered_items.append(line)
-            elif in_receive_section:
-                received_items.append(line)
-
-        parsed_trades.append(
-            {
-                "offered": tuple(
-                    normalize_item_name(item) for item in offered_items if item
-                ),
-                "received": tuple(
-                    normalize_item_name(item) for item in received_items if item
-                ),
-            }
-        )
-
-    return parsed_trades
-
-
 def _load_sync_state() -> dict[str, int]:
     if not SYNC_STATE_FILE.exists():
         return {"last_byte_offset": 0}
@@ -413,98 +428,487 @@ def _load_sync_state() -> dict[str, int]:
 
 
 def _save_sync_state(offset) -> None:
-    with SYNC_STATE_FILE.open("w") as f:
-        json.dump({"last_byte_offset": offset}, f)
+    write_atomic(SYNC_STATE_FILE, json.dumps({"last_byte_offset": offset}))
 
 
-def _get_log_lines(log_path: Path, state: dict[str, int]) -> tuple[list[str], int]:
+def _iter_log_blocks(log_path: Path, state: dict[str, int]) -> Iterator[bytes]:
+    """Stream whole-line blocks appended since the offset, advancing it past each."""
     with log_path.open("rb") as f:
         file_size = log_path.stat().st_size
 
         if file_size < state["last_byte_offset"]:
-            state["last_byte_offset"] = 0
+            state["last_byte_offset"] = 0  # Log was recreated by a new session
 
         f.seek(state["last_byte_offset"])
-        lines = f.read().decode("utf-8").splitlines()
-        offset = f.tell()
+        carry = b""
 
-    return lines, offset
+        # Read in chunks to bound memory, carrying a line the game is still writing
+        while chunk := f.read(LOG_CHUNK_BYTES):
+            data = carry + chunk
+            end = data.rfind(b"\n") + 1
+            carry = data[end:]
+            if not end:
+                continue
 
+            yield data[:end]
+            state["last_byte_offset"] += end
+
+
+def _read_session_start(log_path: Path) -> float | None:
+    with log_path.open("rb") as f:
+        head = f.read(LOG_HEADER_BYTES)
+
+    return parse_session_start(head.decode("utf-8", errors="replace"))
+
+
+def _read_trades(
+    log_path: Path, state: dict[str, int], parser: TradeParser
+) -> list[dict[str, Any]]:
+    """Trades appended since the saved offset, leaving it at a dialog still open."""
+    trades = []
+    dialog_offset = None
+
+    for block in _iter_log_blocks(log_path, state):
+        text = block.decode("utf-8", errors="replace")  # Don't abort on bad bytes
+        trades.extend(parser.feed(text))
+
+        if not parser.recording:
+            dialog_offset = None
+        elif parser.dialog_start is not None:
+            # Replaced bytes can change the length of a line but not the line count
+            lines = text.count("\n", 0, parser.dialog_start)
+            dialog_offset = (
+                state["last_byte_offset"]
+                + len(block)
+                - len(block.split(b"\n", lines)[-1])
+            )
+
+    if dialog_offset is not None:
+        state["last_byte_offset"] = dialog_offset  # Read the dialog again once it ends
+
+    return trades
 
-async def _update_listings(
-    listings: list[dict[str, Any]],
-    trades: list[dict[str, tuple[str, ...]]],
-    session: aiohttp.ClientSession,
-    headers: dict[str, str],
-) -> None:
-    """Decrement quantities or delete listings based on trade patterns in EE.log"""
-    sync_occurred = False
-    for trade in trades:
-        candidates = []
-        for listing in listings:
-            if listing["item"] in trade["offered"]:
-                candidates.append(listing)
 
-        if not candidates:
+def _plan_listing_updates(
+    listings: list[Listing], trades: list[dict[str, Any]]
+) -> tuple[dict[str, tuple[Listing, int]], list[dict[str, str]]]:
+    """Remaining quantity of each listing sold from, and what each trade matched."""
+    index: dict[str, list[Listing]] = {}
+    for listing in listings:
+        index.setdefault(listing.item, []).append(listing)
+
+    updates: dict[str, tuple[Listing, int]] = {}
+    matches: list[dict[str, str]] = []
+    for trade in trades:
+        matched: dict[str, str] = {}
+        matches.append(matched)
+        offered = trade["offered"]
+        if not offered:
             continue
 
-        sync_occurred = True
+        plat_per_item = trade_platinum(trade) // len(offered)
+
+        for name in dict.fromkeys(offered):
+            candidates = index.get(name)
+            if not candidates:
+                continue
+
+            # The listing priced closest to the platinum received per item
+            candidate = min(
+                candidates, key=lambda listing: abs(plat_per_item - listing.price)
+            )
+            _, quantity = updates.get(candidate.id, (candidate, candidate.quantity))
+            quantity -= offered.count(name)
+            updates[candidate.id] = (candidate, quantity)
+            matched[name] = candidate.id
+
+            if quantity <= 0:
+                candidates.remove(candidate)  # Sold out, later trades can't match it
+
+    return (updates, matches)
+
+
+async def _apply_listing_updates(
+    updates: list[dict[str, Any]], client: WFMClient, concurrency: int
+) -> list[dict[str, Any]]:
+    """Send listing edits and deletes concurrently, returning the ones to retry."""
+    pending = iter(updates)
+    failed = []
+
+    async def worker() -> None:
+        for update in pending:
+            try:
+                if update["quantity"] <= 0:
+                    await client.delete_listing(update["id"])
+                else:
+                    await client.edit_listing(
+                        update["id"],
+                        **{
+                            field: update[field]
+                            for field in BUMP_FIELDS
+                            if update[field] is not None
+                        },
+                    )
+            except aiohttp.ClientResponseError as e:
+                # Gone counts as done, other rejections but throttling would fail again
+                if e.status == 404:
+                    print(f"{update['item']} listing no longer exists.")
+                elif e.status == 429 or e.status >= 500:
+                    failed.append(update)
+                    print(f"Failed to sync {update['item']} listing ({e}).")
+                else:
+                    print(f"Dropped update to {update['item']} listing ({e}).")
+                continue
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failed.append(update)
+                print(f"Failed to sync {update['item']} listing ({e}).")
+                continue
+
+            if update["quantity"] <= 0:
+                print(f"Deleted {update['item']} listing.")
+            else:
+                print(
+                    f"Updated {update['item']} listing quantity to {update['quantity']}."
+                )
+
+    print(f"\nSyncing {len(updates)} listings...\n")
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(updates)))))
+    print()
+
+    return failed
+
 
-        print("\nSyncing listings...\n")
+async def _commit_sync_batch(
+    client: WFMClient, ledger: TradeLedger, concurrency: int = SYNC_CONCURRENCY
+) -> list[dict[str, Any]]:
+    """Apply the journaled batch, then record its trades and advance the offset."""
+    batch = SYNC_JOURNAL.load()
+    if batch is None:
+        return []
 
-        plat_received = sum(
-            int(item.split()[-1]) for item in trade["received"] if "Platinum" in item
+    if batch["pending"]:
+        failed = await _apply_listing_updates(batch["pending"], client, concurrency)
+        if failed:
+            # Kept for the next attempt, leaving the offset where it was
+            SYNC_JOURNAL.write({**batch, "pending": failed})
+            return failed
+
+    ledger.record(batch["trades"], batch["matches"], batch["session_start"])
+    _save_sync_state(batch["offset"])
+    SYNC_JOURNAL.clear()
+
+    return []
+
+
+async def _update_listings(
+    listings: list[Listing],
+    trades: list[dict[str, Any]],
+    client: WFMClient,
+    ledger: TradeLedger,
+    session_start: float | None,
+    offset: int,
+) -> list[dict[str, Any]]:
+    """Decrement or delete the listings sold by trades read up to offset."""
+    trades = ledger.new_trades(trades, session_start)  # Skip ones already applied
+    if not trades:
+        _save_sync_state(offset)
+        print("\nNo new trades.\n")
+        return []
+
+    updates, matches = _plan_listing_updates(listings, trades)
+    if not updates:
+        print("\nNo listings synced.\n")
+
+    # Journaled before any update is sent, so an interrupted sync can resume.
+    # Updates carry the price and visibility read now, so a later retry can
+    # undo edits made on the site since.
+    fields = ["id", "item", "price", "quantity", "rank", "visible"]
+    SYNC_JOURNAL.write(
+        {
+            "offset": offset,
+            "session_start": session_start,
+            "trades": trades,
+            "matches": matches,
+            "pending": [
+                {
+                    **{field: getattr(listing, field) for field in fields},
+                    "quantity": quantity,
+                }
+                for listing, quantity in updates.values()
+            ],
+        }
+    )
+
+    return await _commit_sync_batch(client, ledger)
+
+
+async def resume_sync(
+    client: WFMClient, ledger: TradeLedger
+) -> tuple[bool, str | None]:
+    """Finish a sync that was interrupted before its listing updates all went through."""
+    if SYNC_JOURNAL.load() is None:
+        return (True, None)
+
+    print("\nResuming interrupted sync...")
+    failed = await _commit_sync_batch(client, ledger)
+    if failed:
+        return (
+            False,
+            f"{len(failed)} listing updates are still pending, "
+            "'sync discard' drops them.",
         )
 
-        item_count = trade["offered"].count(candidates[0]["item"])
-        plat_per_item = plat_received // item_count
-        candidate = min(
-            candidates, key=lambda listing: abs(plat_per_item - listing["price"])
+    return (True, None)
+
+
+async def discard_sync(ledger: TradeLedger) -> tuple[bool, str | None]:
+    """Give up on the pending updates of an interrupted sync and move past its trades."""
+    async with SYNC_LOCK:
+        batch = SYNC_JOURNAL.load()
+        if batch is None:
+            return (False, "No pending sync to discard.")
+
+        ledger.record(batch["trades"], batch["matches"], batch["session_start"])
+        _save_sync_state(batch["offset"])
+        SYNC_JOURNAL.clear()
+
+    print(f"\nDiscarded {len(batch['pending'])} pending listing updates.\n")
+
+    return (True, None)
+
+
+async def sync(
+    catalog: ItemCatalog,
+    user: str,
+    client: WFMClient,
+    ledger: TradeLedger,
+) -> tuple[bool, str | None]:
+    async with SYNC_LOCK:
+        success, error = await resume_sync(client, ledger)
+        if not success:
+            return (False, error)
+
+        user_listings = await client.get_user_listings(user, catalog, refresh=True)
+        if not user_listings:
+            return (False, "No listings found.")
+        log_path = _get_log_path()
+        state = _load_sync_state()
+        trades = _read_trades(log_path, state, TradeParser())
+        if not trades:
+            _save_sync_state(state["last_byte_offset"])
+            return (False, "No trades found.")
+        failed = await _update_listings(
+            user_listings,
+            trades,
+            client,
+            ledger,
+            _read_session_start(log_path),
+            state["last_byte_offset"],
         )
 
-        candidate["quantity"] -= item_count
+    if failed:
+        return (False, f"Failed to sync {len(failed)} listings, they'll be retried.")
+
+    return (True, None)
+
+
+# ================================== BACKFILL ====================================
 
-        if candidate["quantity"] <= 0:
-            await delete_listing(session, candidate["id"], headers)
-            listings.remove(candidate)
-            print(f"Deleted {candidate['item']} listing.")
+
+def _find_logs(paths: list[str]) -> tuple[list[Path], str | None]:
+    log_paths = []
+    for raw_path in paths:
+        path = Path(raw_path).expanduser()
+        if path.is_dir():
+            log_paths.extend(sorted(path.glob("*.log")))
+        elif path.is_file():
+            log_paths.append(path)
         else:
-            fields = ["price", "quantity", "rank", "visible"]
-            kwargs = {
-                field: candidate[field]
-                for field in fields
-                if candidate[field] is not None
-            }
-            await edit_listing(session, headers, candidate["id"], **kwargs)
-            print(
-                f"Updated {candidate['item']} listing quantity to {candidate['quantity']}."
+            return ([], f"'{raw_path}' not found.")
+
+    return (list(dict.fromkeys(log_paths)), None)
+
+
+async def _parse_logs(
+    log_paths: list[Path], workers: int | None = BACKFILL_WORKERS
+) -> list[list[dict[str, Any]]]:
+    """Trades in each log, parsed in parallel from ranges cut at trade boundaries."""
+    loop = asyncio.get_running_loop()
+    ranges = [
+        (index, start, end)
+        for index, log_path in enumerate(log_paths)
+        for start, end in split_log(log_path, BACKFILL_SPLIT_BYTES)
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(ranges) <= 1:
+        # Not worth starting processes for, parse on a thread to keep the loop free
+        results = await asyncio.to_thread(
+            lambda: [
+                parse_log_range(log_paths[index], start, end, LOG_CHUNK_BYTES)
+                for index, start, end in ranges
+            ]
+        )
+    else:
+        # Spawned rather than forked, as forking a threaded process can deadlock
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool,
+                        parse_log_range,
+                        log_paths[index],
+                        start,
+                        end,
+                        LOG_CHUNK_BYTES,
+                    )
+                    for index, start, end in ranges
+                )
             )
 
-        await asyncio.sleep(0.5)  # Rate limit
+    # Ranges are in log order, so concatenating keeps every log's trades in order
+    trades: list[list[dict[str, Any]]] = [[] for _ in log_paths]
+    for (index, _, _), range_trades in zip(ranges, results):
+        trades[index].extend(range_trades)
 
-    print()
+    return trades
 
-    if not sync_occurred:
-        print("\nNo listings synced.\n")
 
+async def backfill(paths: list[str], ledger: TradeLedger) -> tuple[bool, str | None]:
+    """Import trades from archived logs into the ledger, without touching listings."""
+    log_paths, error = _find_logs(paths)
+    if error is not None:
+        return (False, error)
+    if not log_paths:
+        return (False, "No log files found.")
 
-async def sync(
-    id_to_name: dict[str, str],
+    print(f"\nParsing {len(log_paths)} logs...\n")
+    log_trades = await _parse_logs(log_paths)
+
+    found = imported = 0
+    for log_path, trades in zip(log_paths, log_trades):
+        found += len(trades)
+        # Not applied, so a sync that hasn't read them yet still updates listings
+        imported += ledger.record(
+            trades, [{} for _ in trades], _read_session_start(log_path), applied=False
+        )
+
+    print(f"Imported {imported} new of {found} trades.\n")
+
+    return (True, None)
+
+
+# ================================ FOLLOW MODE ==================================
+
+
+async def _log_changes(log_path: Path):
+    """Yield once at start and whenever EE.log may have grown, using inotify if able."""
+    yield
+
+    if watchfiles is None:
+        last_stat = None
+        while True:
+            await asyncio.sleep(LOG_POLL_SECONDS)
+            try:
+                stat = log_path.stat()
+            except FileNotFoundError:
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != last_stat:
+                last_stat = (stat.st_size, stat.st_mtime_ns)
+                yield
+
+    while True:
+        try:
+            async for _ in watchfiles.awatch(log_path):
+                yield
+        except FileNotFoundError:
+            await asyncio.sleep(LOG_POLL_SECONDS)  # Wait for the game to create it
+
+
+async def follow(
+    get_catalog: Callable[[], ItemCatalog],
     user: str,
-    session: aiohttp.ClientSession,
-    headers: dict[str, str],
-) -> tuple[bool, str | None]:
-    user_listings = await extract_user_listings(session, user, id_to_name, headers)
-    if not user_listings:
-        return (False, "No listings found.")
+    client: WFMClient,
+    ledger: TradeLedger,
+) -> None:
+    """Apply trades from EE.log as they are appended, until cancelled."""
     log_path = _get_log_path()
-    state = _load_sync_state()
-    lines, offset = _get_log_lines(log_path, state)
-    _save_sync_state(offset)
-    trade_chunks = _extract_trade_chunks(lines)
-    if not trade_chunks:
-        return (False, "No trades found.")
-    trades = _parse_trade_items(trade_chunks)
-    await _update_listings(user_listings, trades, session, headers)
+
+    async for _ in _log_changes(log_path):
+        try:
+            async with SYNC_LOCK:
+                if not log_path.exists():
+                    continue
+
+                if SYNC_JOURNAL.load() is not None:
+                    # Finish the pending batch before reading past it
+                    with patch_stdout(raw=True):
+                        success, error = await resume_sync(client, ledger)
+                        if not success:
+                            print(f"{error}\n")
+                            continue
+
+                # The saved offset is at any dialog still open, so a fresh parser
+                # resumes it, and a failed sync leaves no parser state behind
+                state = _load_sync_state()
+                trades = _read_trades(log_path, state, TradeParser())
+                if not trades:
+                    _save_sync_state(state["last_byte_offset"])
+                    continue
+
+                catalog = get_catalog()
+                # Printed above the prompt, which stays usable while listings sync
+                with patch_stdout(raw=True):
+                    user_listings = await client.get_user_listings(
+                        user, catalog, refresh=True
+                    )
+                    failed = await _update_listings(
+                        user_listings,
+                        trades,
+                        client,
+                        ledger,
+                        _read_session_start(log_path),
+                        state["last_byte_offset"],
+                    )
+                    if failed:
+                        print(
+                            f"Failed to sync {len(failed)} listings, they'll be retried.\n"
+                        )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            run_in_terminal(
+                lambda e=e: print(f"\nFollow mode failed to sync listings ({e}).\n")
+            )
+        except Exception as e:
+            # Keep following, EE.log or the sync files may be readable next time
+            run_in_terminal(
+                lambda e=e: print(f"\nFollow mode failed to read trades ({e!r}).\n")
+            )
+
+
+def report_follow_end(task: asyncio.Task) -> None:
+    """Done callback for the follow task, reporting why it stopped if it failed."""
+    if not task.cancelled() and task.exception() is not None:
+        run_in_terminal(
+            lambda: print(f"\nStopped following EE.log ({task.exception()}).\n")
+        )
+
+
+# ==================================== SALES =====================================
+
+
+def sales(
+    ledger: TradeLedger, daily: bool = False, days: int = SALES_DAYS
+) -> tuple[bool, str | None]:
+    """Report sales from the trade ledger, per item or per item per day."""
+    rows = ledger.sales_by_day(days) if daily else ledger.sales_by_item(days)
+    if not rows:
+        return (False, f"No sales in the last {days} days.")
+
+    if daily:
+        display_daily_sales(rows)
+    else:
+        display_sales(rows, days)
 
     return (True, None)
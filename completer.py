@@ -0,0 +1,90 @@
+from collections.abc import Callable, Iterable
+
+from prompt_toolkit.completion import (
+    CompleteEvent,
+    Completer,
+    Completion,
+    ThreadedCompleter,
+)
+from prompt_toolkit.document import Document
+
+from items import ItemCatalog
+
+COMMANDS = [
+    "search",
+    "seller",
+    "listings",
+    "bump",
+    "show",
+    "hide",
+    "delete",
+    "add",
+    "edit",
+    "copy",
+    "links",
+    "sync",
+    "sales",
+    "status",
+    "catalog",
+    "watch",
+    "unwatch",
+    "profile",
+    "stats",
+    "clear",
+    "help",
+    "exit",
+    "quit",
+]
+
+ITEM_COMMANDS = {"search", "add", "watch", "unwatch"}
+
+MAX_COMPLETIONS = 10
+
+
+class ItemCompleter(Completer):
+    """Complete command names and the item name argument of item commands."""
+
+    def __init__(self, get_catalog: Callable[[], ItemCatalog]) -> None:
+        self.get_catalog = get_catalog
+
+    def get_completions(
+        self, document: Document, complete_event: CompleteEvent
+    ) -> Iterable[Completion]:
+        text = document.text_before_cursor.lstrip()
+
+        if " " not in text:
+            for command in COMMANDS:
+                if command.startswith(text.lower()):
+                    yield Completion(command, start_position=-len(text))
+            return
+
+        command, argument = text.split(" ", 1)
+        if command.lower() not in ITEM_COMMANDS:
+            return
+
+        argument = argument.lstrip()
+        if argument.startswith('"'):
+            partial = argument[1:]
+            if '"' in partial:
+                return  # Item name already closed
+        elif argument.startswith("'"):
+            partial = argument[1:]
+            if "'" in partial:
+                return
+        else:
+            partial = argument
+
+        if not partial or partial.isdigit():
+            return
+
+        for item in self.get_catalog().index.match(partial, MAX_COMPLETIONS):
+            yield Completion(
+                f'"{item.name}"' if " " in item.name else item.name,
+                start_position=-len(argument),
+                display=item.name,
+            )
+
+
+def build_completer(get_catalog: Callable[[], ItemCatalog]) -> Completer:
+    """Item completer that runs off the event loop."""
+    return ThreadedCompleter(ItemCompleter(get_catalog))
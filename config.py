@@ -1,13 +1,59 @@
+import os
 from pathlib import Path
 
-APP_DIR = Path.home() / ".wfm"
+# The WFM_* environment variables point wfm at a local mock server for benchmarks
+APP_DIR = Path(os.environ.get("WFM_APP_DIR", Path.home() / ".wfm"))
 COOKIES_FILE = APP_DIR / "cookies.json"
 HISTORY_FILE = APP_DIR / "history"
 SYNC_STATE_FILE = APP_DIR / "sync_state.json"
+SYNC_JOURNAL_FILE = APP_DIR / "sync_journal.json"
+CATALOG_CACHE_FILE = APP_DIR / "catalog.json"
+LEDGER_FILE = APP_DIR / "trades.db"
+STATS_FILE = os.environ.get("WFM_STATS_FILE")  # Request stats are written here on exit
+
+CATALOG_FRESH_SECONDS = 60 * 60  # Used as-is
+CATALOG_MAX_AGE_SECONDS = 7 * 24 * 60 * 60  # Served while revalidating until this age
 
 USER_AGENT = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:146.0) Gecko/20100101 Firefox/146.0",
 }
 
-WS_URI = "wss://ws.warframe.market/socket"
+API_URL = os.environ.get("WFM_API_URL", "https://api.warframe.market/v2")
+
+CONNECTION_LIMIT = 10  # Concurrent connections in the shared pool
+DNS_CACHE_SECONDS = 300
+KEEPALIVE_SECONDS = 60  # Idle time before a pooled connection is closed
+REQUEST_TIMEOUT_SECONDS = 30
+
+RATE_LIMIT_PER_SECOND = 3.0  # Starting rate, adapted to 429 responses
+RATE_LIMIT_MIN_PER_SECOND = 0.5
+RATE_LIMIT_MAX_PER_SECOND = 10.0
+RATE_LIMIT_INCREASE = 0.1  # Added to the rate after each successful request
+RATE_LIMIT_BURST = 3.0
+MAX_THROTTLE_RETRIES = 5
+
+ORDER_BOOK_TTL_SECONDS = 30  # Served without revalidation
+ORDER_BOOK_STALE_SECONDS = 300  # Served while revalidating until this age
+ORDER_BOOK_MAX_ENTRIES = 64
+ORDER_BOOK_MAX_ORDERS = 50_000  # Total orders held across all cached items
+
+OWN_LISTINGS_MAX_AGE_SECONDS = 300  # Reconcile the local listing mirror after this
+
+BUMP_CONCURRENCY = 4  # Listings bumped in parallel by 'bump all'
+SYNC_CONCURRENCY = 4  # Listing edits and deletes in flight during a sync
+
+SALES_DAYS = 30  # Default window of the 'sales' report
+
+LOG_CHUNK_BYTES = 1024 * 1024  # EE.log is streamed in chunks of this size
+LOG_HEADER_BYTES = 64 * 1024  # Read for the session start time
+LOG_POLL_SECONDS = 1.0  # EE.log check interval for 'sync follow' without watchfiles
+
+BACKFILL_SPLIT_BYTES = 64 * 1024 * 1024  # Logs are parsed in parts of about this size
+BACKFILL_WORKERS = None  # Processes for 'sync backfill', None for one per core
+
+WS_URI = os.environ.get("WFM_WS_URI", "wss://ws.warframe.market/socket")
 AUTH_MESSAGE = '{"route":"@wfm|cmd/auth/signIn","payload":{"token":""}}'
+WS_BACKOFF_BASE_SECONDS = 1.0  # Reconnect delay doubles from this, with full jitter
+WS_BACKOFF_MAX_SECONDS = 60.0
+WS_STABLE_SECONDS = 30  # A connection that lasted this long resets the backoff
+WS_RESPONSE_TIMEOUT_SECONDS = 10
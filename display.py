@@ -1,5 +1,10 @@
+import time
 from typing import Any
 
+from items import ItemCatalog
+from listing import Listing
+from orderbook import LiveOrderBooks
+
 COLUMNS = [
     "#",
     "seller",
@@ -36,22 +41,22 @@ STATUS_MAPPING = {"offline": "Offline", "online": "Online", "ingame": "In Game"}
 
 
 def build_seller_rows(
-    listings: list[dict[str, Any]], max_ranks: dict[str, int | None]
+    listings: list[Listing], catalog: ItemCatalog
 ) -> list[dict[str, str]]:
     """Build rows for table rendering."""
-    show_rank = any(listing.get("rank") is not None for listing in listings)
+    show_rank = any(listing.rank is not None for listing in listings)
     data_rows = []
     for i, listing in enumerate(listings, start=1):
         row = {
             "#": str(i),
-            "item": listing["item"],
-            "price": f"{listing['price']}p",
-            "quantity": str(listing["quantity"]),
-            "updated": str(listing["updated"]),
+            "item": listing.item,
+            "price": f"{listing.price}p",
+            "quantity": str(listing.quantity),
+            "updated": str(listing.updated),
         }
 
-        if show_rank and listing.get("rank") is not None:
-            row["rank"] = f"{listing['rank']}/{max_ranks[listing['itemId']]}"
+        if show_rank and listing.rank is not None:
+            row["rank"] = f"{listing.rank}/{catalog[listing.item_id].max_rank}"
 
         data_rows.append(row)
 
@@ -59,23 +64,23 @@ def build_seller_rows(
 
 
 def build_listings_rows(
-    listings: list[dict[str, Any]], max_ranks: dict[str, int | None]
+    listings: list[Listing], catalog: ItemCatalog
 ) -> list[dict[str, str]]:
     """Build rows for table rendering."""
-    show_rank = any(listing.get("rank") is not None for listing in listings)
+    show_rank = any(listing.rank is not None for listing in listings)
     data_rows = []
     for i, listing in enumerate(listings, start=1):
         row = {
             "#": str(i),
-            "item": listing["item"],
-            "price": f"{listing['price']}p",
-            "quantity": str(listing["quantity"]),
-            "visibility": "Visible" if listing["visible"] else "Hidden",
-            "updated": str(listing["updated"]),
+            "item": listing.item,
+            "price": f"{listing.price}p",
+            "quantity": str(listing.quantity),
+            "visibility": "Visible" if listing.visible else "Hidden",
+            "updated": str(listing.updated),
         }
 
-        if show_rank and listing.get("rank") is not None:
-            row["rank"] = f"{listing['rank']}/{max_ranks[listing['itemId']]}"
+        if show_rank and listing.rank is not None:
+            row["rank"] = f"{listing.rank}/{catalog[listing.item_id].max_rank}"
 
         data_rows.append(row)
 
@@ -83,24 +88,24 @@ def build_listings_rows(
 
 
 def build_search_rows(
-    listings: list[dict[str, Any]], max_ranks: dict[str, int | None]
+    listings: list[Listing], catalog: ItemCatalog
 ) -> list[dict[str, str]]:
     """Build rows for table rendering."""
     data_rows = []
     for i, listing in enumerate(listings, start=1):
         row = {
             "#": str(i),
-            "seller": listing["seller"],
-            "reputation": str(listing["reputation"]),
-            "status": STATUS_MAPPING[listing["status"]],
-            "item": listing["item"],
-            "price": f"{listing['price']}p",
-            "quantity": str(listing["quantity"]),
-            "updated": str(listing["updated"]),
+            "seller": listing.seller,
+            "reputation": str(listing.reputation),
+            "status": STATUS_MAPPING[listing.status],
+            "item": listing.item,
+            "price": f"{listing.price}p",
+            "quantity": str(listing.quantity),
+            "updated": str(listing.updated),
         }
 
-        if listing.get("rank") is not None:
-            row["rank"] = f"{listing['rank']}/{max_ranks[listing['itemId']]}"
+        if listing.rank is not None:
+            row["rank"] = f"{listing.rank}/{catalog[listing.item_id].max_rank}"
 
         data_rows.append(row)
 
@@ -194,34 +199,162 @@ def display_profile(user_info: dict[str, Any]) -> None:
     print()
 
 
+def display_catalog_status(item_count: int, age: float) -> None:
+    """Display the size and age of the cached item catalog."""
+    minutes = int(age // 60)
+    if minutes < 60:
+        age_text = f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    elif minutes < 60 * 24:
+        hours = minutes // 60
+        age_text = f"{hours} hour{'s' if hours != 1 else ''} ago"
+    else:
+        days = minutes // (60 * 24)
+        age_text = f"{days} day{'s' if days != 1 else ''} ago"
+    print()
+    print(f"Items:   {item_count}")
+    print(f"Updated: {age_text}")
+    print()
+
+
+def display_watched(live_books: LiveOrderBooks, catalog: ItemCatalog) -> None:
+    """Display watched items with their live order book sizes."""
+    now = time.monotonic()
+    print()
+    for book in live_books.books.values():
+        age = int(now - book.synced_at)
+        print(
+            f"{catalog[book.item_id].name:40} {len(book.orders):>5} listings  "
+            f"synced {age}s ago"
+        )
+    print()
+    print(
+        f"Live: {'yes' if live_books.is_live() else 'no'}  "
+        f"Events applied: {live_books.events_applied}"
+    )
+    print()
+
+
+def display_sales(rows: list[dict[str, Any]], days: int) -> None:
+    """Display items sold with platinum earned and sales velocity."""
+    header = f"{'Item':40} {'Sold':>6} {'Platinum':>9} {'Average':>8} {'Per day':>8}"
+    print()
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['item']:40} {row['sold']:>6} {row['platinum']:>9} "
+            f"{row['average']:>8} {row['per_day']:>8.2f}"
+        )
+    print()
+    print(
+        f"Total: {sum(row['sold'] for row in rows)} sold for "
+        f"{sum(row['platinum'] for row in rows)} platinum in the last {days} days"
+    )
+    print()
+
+
+def display_daily_sales(rows: list[dict[str, Any]]) -> None:
+    """Display platinum earned per item per day."""
+    header = f"{'Day':10} {'Item':40} {'Sold':>6} {'Platinum':>9}"
+    print()
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['day']:10} {row['item']:40} {row['sold']:>6} {row['platinum']:>9}")
+    print()
+
+
+def display_stats(stats: dict[str, Any]) -> None:
+    """Display per-endpoint request timings and client counters."""
+    cache = stats["order_book_cache"]
+    print()
+    print(
+        f"Requests: {stats['requests']}  "
+        f"Connections: {stats['connections_created']} new, "
+        f"{stats['connections_reused']} reused  "
+        f"Coalesced: {stats['coalesced']}  "
+        f"Throttled: {stats['throttled']} ({stats['rate_limit']:.1f}/s)"
+    )
+    print(
+        f"Order book cache: {cache['hits']} hits, {cache['stale_hits']} stale, "
+        f"{cache['misses']} misses, {cache['evictions']} evictions"
+    )
+    live_books = stats["live_books"]
+    print(
+        f"Live order books: {live_books['watched']} watched, "
+        f"{live_books['events_applied']} events applied"
+    )
+
+    if not stats["endpoints"]:
+        print()
+        return
+
+    header = (
+        f"{'Endpoint':32} {'Count':>6} {'Errors':>6} {'Total p50':>10} "
+        f"{'p95':>8} {'TTFB p50':>9} {'DNS':>8} {'Connect':>8} {'Decode':>8} "
+        f"{'Avg KB':>8}"
+    )
+    print()
+    print(header)
+    print("-" * len(header))
+
+    def format_ms(histogram: dict[str, Any], key: str, width: int) -> str:
+        if not histogram["count"]:
+            return "-".rjust(width)  # Nothing recorded, e.g. only reused connections
+        return f"{histogram[key]:.1f}ms".rjust(width)
+
+    for endpoint, metrics in stats["endpoints"].items():
+        total = metrics["total_ms"]
+        print(
+            f"{endpoint:32} {total['count']:>6} {metrics['errors']:>6} "
+            f"{format_ms(total, 'p50', 10)} {format_ms(total, 'p95', 8)} "
+            f"{format_ms(metrics['ttfb_ms'], 'p50', 9)} "
+            f"{format_ms(metrics['dns_ms'], 'p50', 8)} "
+            f"{format_ms(metrics['connect_ms'], 'p50', 8)} "
+            f"{format_ms(metrics['decode_ms'], 'p50', 8)} "
+            f"{metrics['bytes']['mean'] / 1024:>8.1f}"
+        )
+    print()
+    print("Timings are bucket upper bounds; connect covers TCP and TLS after DNS.")
+    print()
+
+
 def display_help() -> None:
     """Display all commands and example usage."""
     print()
     print("Available commands:")
     print(
-        "  search <item|number> [sort <field>] [order <asc|desc>] [rank <number>] [status <all|ingame|online|offline>]"
+        "  search <item|number> [sort <field>] [order <asc|desc>] [rank <number>] [status <all|ingame|online|offline>] [limit <number>]"
     )
     print("      Search for item listings (all filters optional)")
     print('      Example: search "ammo drum"')
     print('      Example: search "ammo drum" rank 5 sort reputation')
     print("      Example: search serration rank 0 status ingame")
+    print("      Example: search serration limit 20  (only the 20 best listings)")
     print("      Example: search 3  (searches item at position 3 from current results)")
     print()
-    print("  seller <number> [sort <field>] [order <asc|desc>] [rank <number>]")
+    print(
+        "  seller <number> [sort <field>] [order <asc|desc>] [rank <number>] [limit <number>]"
+    )
     print("      View listings from a seller in current search results")
     print("      Example: seller 3")
     print("      Example: seller 5 sort price")
     print()
-    print("  listings [sort <field>] [order <asc|desc>] [rank <number>]")
+    print(
+        "  listings [refresh] [sort <field>] [order <asc|desc>] [rank <number>] [limit <number>]"
+    )
     print("      Display your active listings")
     print("      Example: listings")
+    print("      Example: listings refresh")
     print("      Example: listings sort price")
     print("      Example: listings rank 0 sort updated order desc")
+    print("      Example: listings sort price limit 10")
     print()
-    print("  bump <number|all>")
+    print("  bump <number|all> [concurrency <number>]")
     print("      Update listing timestamp to improve visibility in search results")
     print("      Example: bump 3")
     print("      Example: bump all")
+    print("      Example: bump all concurrency 8")
     print()
     print("  show <number|all>")
     print("      Make listing(s) visible on Warframe Market")
@@ -259,23 +392,52 @@ def display_help() -> None:
     print("      Expands sets into individual parts and chunks into 300-char messages")
     print("      Example: links")
     print()
-    print("  sync")
+    print("  sync [follow|stop|discard|backfill <files|dirs>]")
     print("      Update your listings based on completed trades from game log")
+    print("      'follow' keeps syncing in the background as trades complete")
+    print("      'discard' drops listing updates an interrupted sync couldn't apply")
+    print("      'backfill' records trades from archived logs for 'sales'")
     print("      Example: sync")
+    print("      Example: sync follow")
+    print("      Example: sync backfill ~/wf-logs")
+    print()
+    print("  sales [daily] [days <number>]")
+    print("      Report sales recorded from EE.log by 'sync' (default: last 30 days)")
+    print("      Example: sales")
+    print("      Example: sales daily days 7")
     print()
     print("  status <ingame|online|invisible>")
     print("      Change your online status on Warframe Market")
     print("      Example: status ingame")
     print("      Example: status invisible")
     print()
+    print("  catalog [refresh]")
+    print("      Show the cached item catalog or force it to be refreshed")
+    print("      Example: catalog")
+    print("      Example: catalog refresh")
+    print()
     print("  profile")
     print("      Display your account information")
     print()
+    print("  watch [item]")
+    print("      Keep a live order book for an item so searches are answered locally")
+    print("      Without an item, list watched items")
+    print('      Example: watch "ammo drum"')
+    print()
+    print("  unwatch <item>")
+    print("      Stop keeping a live order book for an item")
+    print('      Example: unwatch "ammo drum"')
+    print()
+    print("  stats")
+    print("      Show request timings per API endpoint")
+    print("      Set WFM_STATS_FILE to also write them as JSON on exit")
+    print()
     print("  clear")
     print("      Clear the screen")
     print()
     print("  help")
     print("      Show this help message")
+    print("      Press Tab to complete commands and item names")
     print()
     print("  exit, quit")
     print("      Exit the program")
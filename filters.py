@@ -1,40 +1,76 @@
+import heapq
+import operator
+from collections.abc import Callable
+from functools import partial
+from itertools import compress
+from operator import attrgetter
 from typing import Any
 
+from listing import Listing
+
+BY_UPDATED = attrgetter("updated")
+REQUIRED_SORTS = {"item", "price", "quantity", "updated"}  # Set on every listing
+
 
 def filter_listings(
-    listings: list[dict[str, Any]], rank: int | None, status: str
-) -> list[dict[str, Any]]:
+    listings: list[Listing], rank: int | None, status: str
+) -> list[Listing]:
     if rank is not None:
-        listings = [listing for listing in listings if listing.get("rank") == rank]
+        listings = [listing for listing in listings if listing.rank == rank]
     if status != "all":
-        listings = [listing for listing in listings if listing.get("status") == status]
+        listings = [listing for listing in listings if listing.status == status]
 
     return listings
 
 
+def _sort_key(
+    listings: list[Listing], sort_by: str, is_desc: bool
+) -> Callable[[Listing], Any]:
+    """Key for one field, picked once for the listings rather than per listing.
+
+    A plain attribute getter is used unless some listing lacks the field, like
+    unranked items, in which case those sort last either way.
+    """
+    # Special case: user-facing sort name is "visibility" but attribute is "visible"
+    get = attrgetter("visible" if sort_by == "visibility" else sort_by)
+    if sort_by in REQUIRED_SORTS or None not in map(get, listings):
+        return get
+
+    missing = float("-inf") if is_desc else float("inf")
+    return lambda listing: missing if (value := get(listing)) is None else value
+
+
 def sort_listings(
-    listings: list[dict[str, Any]],
+    listings: list[Listing],
     sort_by: str,
     order: str | None,
     default_orders: dict[str, str],
-) -> tuple[list[dict[str, Any]], str]:
+    limit: int | None = None,
+) -> tuple[list[Listing], str]:
+    """Sort listings by one field, newest first on ties, keeping the first limit.
+
+    With a limit, a heap finds the key of the last listing kept, and only the
+    listings at or before it are sorted, leaving the list passed in untouched.
+    """
     if order is None:
         order = default_orders[sort_by]
 
     is_desc = order == "desc"
+    key = _sort_key(listings, sort_by, is_desc)
 
-    listings.sort(key=lambda listing: listing["updated"], reverse=True)
-
-    def get_sort_key(listing):
-        # Special case: user-facing sort name is "visibility" but data key is "visible"
-        if sort_by == "visibility":
-            return "visible" if listing["visible"] else "hidden"
-
-        if listing[sort_by] is None:
-            return float("-inf") if is_desc else float("inf")
+    if limit is not None and limit < len(listings):
+        keys = list(map(key, listings))
+        select = heapq.nlargest if is_desc else heapq.nsmallest
+        cutoff = select(limit, keys)[-1]
+        within = partial(operator.le if is_desc else operator.ge, cutoff)
+        listings = list(compress(listings, map(within, keys)))
 
-        return listing[sort_by]
+    # Two stable passes on plain keys beat one pass on (field, updated) tuples
+    if sort_by != "updated":
+        listings.sort(key=BY_UPDATED, reverse=True)
+    listings.sort(key=key, reverse=is_desc)
 
-    listings.sort(key=get_sort_key, reverse=is_desc)
+    if limit is not None:
+        del listings[limit:]
 
     return (listings, order)
@@ -0,0 +1,241 @@
+import sys
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterator
+from typing import Any
+
+FUZZY_THRESHOLD = 0.4  # Minimum trigram similarity for a fuzzy match
+
+PART_SUFFIXES = [
+    "Set",
+    "Blueprint",
+    "Barrel",
+    "Receiver",
+    "Casing",
+    "Pod",
+    "Weapon Pod",
+    "Engine",
+    "Stock",
+    "Neuroptics",
+    "Chassis",
+    "Systems",
+    "Gauntlet",
+    "Link",
+    "Buckle",
+    "Carapace",
+    "Cerebrum",
+    "Band",
+    "Wings",
+    "Pouch",
+    "Stars",
+    "Harness",
+    "Grip",
+    "Blade",
+    "Lower Limb",
+    "Handle",
+    "Upper Limb",
+    "String",
+]
+
+# ==================================== ITEMS =====================================
+
+
+def get_base_name(item_name: str) -> str:
+    """Extract base name without part suffixes."""
+    words = item_name.split()
+    while words and words[-1] in PART_SUFFIXES:
+        words.pop()
+
+    return " ".join(words)
+
+
+class Item:
+    """Compact record of the item fields used by wfm."""
+
+    __slots__ = ("id", "name", "slug", "tags", "bulk_tradable", "max_rank")
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        slug: str,
+        tags: frozenset[str],
+        bulk_tradable: bool,
+        max_rank: int | None,
+    ) -> None:
+        self.id = id
+        self.name = name
+        self.slug = slug
+        self.tags = tags
+        self.bulk_tradable = bulk_tradable
+        self.max_rank = max_rank
+
+
+# ================================== NAME INDEX ==================================
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Prefix and typo-tolerant lookups over lowercase item names."""
+
+    __slots__ = ("names", "items", "gram_counts", "postings")
+
+    def __init__(self, items: list[Item]) -> None:
+        entries = sorted((item.name.lower(), i) for i, item in enumerate(items))
+        self.names = [name for name, _ in entries]
+        self.items = [items[i] for _, i in entries]
+        self.gram_counts = []
+        self.postings: dict[str, list[int]] = {}
+
+        for position, name in enumerate(self.names):
+            grams = _trigrams(name)
+            self.gram_counts.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+
+    def prefix(self, text: str, limit: int) -> list[Item]:
+        """Items whose name starts with text, in alphabetical order."""
+        text = text.lower()
+        matches = []
+        position = bisect_left(self.names, text)
+
+        while (
+            position < len(self.names)
+            and len(matches) < limit
+            and self.names[position].startswith(text)
+        ):
+            matches.append(self.items[position])
+            position += 1
+
+        return matches
+
+    def fuzzy(self, text: str, limit: int) -> list[Item]:
+        """Items whose name is similar to text, best match first."""
+        grams = _trigrams(text.lower())
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + self.gram_counts[position])
+            if score >= FUZZY_THRESHOLD:
+                scored.append((score, position))
+        scored.sort(key=lambda match: (-match[0], self.names[match[1]]))
+
+        return [self.items[position] for _, position in scored[:limit]]
+
+    def match(self, text: str, limit: int) -> list[Item]:
+        """Prefix matches, topped up with fuzzy matches."""
+        matches = self.prefix(text, limit)
+        if len(matches) < limit:
+            for item in self.fuzzy(text, limit):
+                if item not in matches:
+                    matches.append(item)
+                    if len(matches) == limit:
+                        break
+
+        return matches
+
+
+# =================================== CATALOG ====================================
+
+
+class ItemCatalog:
+    """Item lookups built in a single pass over the item data."""
+
+    __slots__ = ("items", "by_id", "by_name", "index", "by_base_name")
+
+    def __init__(self, items: list[Item]) -> None:
+        self.items = items
+        self.by_id = {item.id: item for item in items}
+        self.by_name = {item.name.lower(): item for item in items}
+        self.index = NameIndex(items)
+        self.by_base_name: dict[str, list[str]] = {}
+        for item in items:
+            self.by_base_name.setdefault(get_base_name(item.name), []).append(item.name)
+
+    @classmethod
+    def from_raw(cls, raw_items: list[dict[str, Any]]) -> "ItemCatalog":
+        """Build a catalog from raw /v2/items data, keeping only the needed fields."""
+        return cls.from_rows(
+            [
+                item["id"],
+                item["i18n"]["en"]["name"],
+                item["slug"],
+                item["tags"],
+                item.get("bulkTradable", False),
+                item.get("maxRank"),
+            ]
+            for item in raw_items
+        )
+
+    @classmethod
+    def from_rows(cls, rows: Any) -> "ItemCatalog":
+        """Build a catalog from compact rows as produced by to_rows."""
+        intern = sys.intern
+        tag_sets: dict[tuple[str, ...], frozenset[str]] = {}
+        items = []
+
+        for item_id, name, slug, tags, bulk_tradable, max_rank in rows:
+            tag_key = tuple(tags)
+            tag_set = tag_sets.get(tag_key)
+            if tag_set is None:
+                tag_set = tag_sets[tag_key] = frozenset(intern(tag) for tag in tags)
+
+            items.append(
+                Item(
+                    intern(item_id),
+                    intern(name),
+                    intern(slug),
+                    tag_set,
+                    bulk_tradable,
+                    max_rank,
+                )
+            )
+
+        return cls(items)
+
+    def to_rows(self) -> list[list[Any]]:
+        """Compact rows suitable for JSON serialization."""
+        return [
+            [
+                item.id,
+                item.name,
+                item.slug,
+                sorted(item.tags),
+                item.bulk_tradable,
+                item.max_rank,
+            ]
+            for item in self.items
+        ]
+
+    def __getitem__(self, item_id: str) -> Item:
+        return self.by_id[item_id]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self.items)
+
+    def find(self, name: str) -> Item | None:
+        """Look up an item by case-insensitive name."""
+        return self.by_name.get(name.lower())
+
+    def set_parts(self, set_name: str) -> list[str]:
+        """Names of the items sharing a set's base name, excluding the set itself."""
+        return [
+            name
+            for name in self.by_base_name.get(get_base_name(set_name), ())
+            if name != set_name
+        ]
+
+    def suggest(self, name: str) -> Item | None:
+        """Closest item to a name that was not found."""
+        matches = self.index.fuzzy(name, 1)
+        return matches[0] if matches else None
@@ -0,0 +1,47 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+
+def write_atomic(path: Path, data: str) -> None:
+    """Replace path with data so that a crash leaves either the old or new file."""
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp_path.replace(path)
+
+    if hasattr(os, "O_DIRECTORY"):  # Make the rename itself durable, POSIX only
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class SyncJournal:
+    """Write-ahead record of a sync batch whose listing updates aren't all applied.
+
+    A batch holds the log offset it was read up to, its trades and the
+    listing updates still pending. It's written before any update is sent
+    and removed once all are acknowledged, so an interrupted sync can be
+    resumed without reading the log again.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self) -> dict[str, Any] | None:
+        if not self.path.exists():
+            return None
+
+        with self.path.open("r") as f:
+            return json.load(f)
+
+    def write(self, batch: dict[str, Any]) -> None:
+        write_atomic(self.path, json.dumps(batch))
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
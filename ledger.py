@@ -0,0 +1,229 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    trade_key TEXT UNIQUE,
+    traded_at REAL NOT NULL,
+    offered TEXT NOT NULL,
+    received TEXT NOT NULL,
+    platinum INTEGER NOT NULL,
+    applied INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS trade_items (
+    trade_id INTEGER NOT NULL REFERENCES trades (id),
+    item TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    platinum REAL NOT NULL,
+    listing_id TEXT
+);
+CREATE INDEX IF NOT EXISTS trades_traded_at ON trades (traded_at);
+CREATE INDEX IF NOT EXISTS trade_items_item ON trade_items (item);
+CREATE INDEX IF NOT EXISTS trade_items_trade_id ON trade_items (trade_id);
+"""
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+def trade_platinum(trade: dict[str, Any]) -> int:
+    return sum(
+        int(item.split()[-1]) for item in trade["received"] if "Platinum" in item
+    )
+
+
+def trade_key(trade: dict[str, Any], session_start: float | None) -> str | None:
+    """Identity of a trade across re-reads of the log it came from.
+
+    The log timestamp alone repeats between sessions, so the items are part of
+    the key as well. Trades without a timestamp can't be told apart and get
+    no key.
+    """
+    if trade["time"] is None:
+        return None
+
+    return json.dumps(
+        [session_start, trade["time"], trade["offered"], trade["received"]]
+    )
+
+
+class TradeLedger:
+    """SQLite record of every trade synced from EE.log.
+
+    Each trade is stored once, keyed by its session and log timestamp, along
+    with one row per item sold carrying its share of the platinum and the
+    listing it was matched to, for per-item sales reports. Trades imported by
+    backfill aren't applied to listings, so sync still treats them as new.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _known_keys(self, keys: list[str | None]) -> dict[str, tuple[int, bool]]:
+        """Id of each stored trade among keys and whether it was applied."""
+        lookup = [key for key in keys if key is not None]
+        known = {}
+        for start in range(0, len(lookup), 500):  # Below SQLite's variable limit
+            batch = lookup[start : start + 500]
+            known.update(
+                (key, (trade_id, bool(applied)))
+                for key, trade_id, applied in self.connection.execute(
+                    "SELECT trade_key, id, applied FROM trades WHERE trade_key IN "
+                    f"({', '.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+
+        return known
+
+    def new_trades(
+        self, trades: list[dict[str, Any]], session_start: float | None
+    ) -> list[dict[str, Any]]:
+        """The trades not already applied to listings by an earlier sync."""
+        keys = [trade_key(trade, session_start) for trade in trades]
+        known = self._known_keys(keys)
+
+        return [
+            trade
+            for trade, key in zip(trades, keys)
+            if key is None or key not in known or not known[key][1]
+        ]
+
+    def record(
+        self,
+        trades: list[dict[str, Any]],
+        matches: list[dict[str, str]],
+        session_start: float | None,
+        applied: bool = True,
+    ) -> int:
+        """Store trades with the listing matched to each item, in one transaction.
+
+        Trades are timed from the session start in the log header, or as of
+        now when the log doesn't have one. Trades already stored are skipped,
+        except that applying a trade only backfilled so far marks it applied
+        with the new matches. Returns the number of trades stored or applied.
+        """
+        now = time.time()
+        trade_rows = []
+        item_rows = []
+        adopted = []
+
+        with self.connection:
+            (next_id,) = self.connection.execute(
+                "SELECT COALESCE(MAX(id), 0) + 1 FROM trades"
+            ).fetchone()
+
+            keys = [trade_key(trade, session_start) for trade in trades]
+            known = self._known_keys(keys)
+
+            for trade, matched, key in zip(trades, matches, keys):
+                trade_id = next_id
+                if key is not None:
+                    if key in known:
+                        known_id, known_applied = known[key]
+                        if known_applied or not applied:
+                            continue
+                        trade_id = known_id  # Backfilled before sync reached it
+                    known[key] = (trade_id, applied)
+
+                platinum = trade_platinum(trade)
+                if trade_id == next_id:
+                    traded_at = (
+                        session_start + trade["time"]
+                        if session_start is not None and trade["time"] is not None
+                        else now
+                    )
+                    trade_rows.append(
+                        (
+                            next_id,
+                            key,
+                            traded_at,
+                            json.dumps(trade["offered"]),
+                            json.dumps(trade["received"]),
+                            platinum,
+                            applied,
+                        )
+                    )
+                    next_id += 1
+                else:
+                    adopted.append((trade_id,))
+
+                items = [item for item in trade["offered"] if "Platinum" not in item]
+                for item in dict.fromkeys(items):
+                    quantity = items.count(item)
+                    item_rows.append(
+                        (
+                            trade_id,
+                            item,
+                            quantity,
+                            platinum * quantity / len(items),
+                            matched.get(item),
+                        )
+                    )
+
+            self.connection.executemany(
+                "UPDATE trades SET applied = 1 WHERE id = ?", adopted
+            )
+            self.connection.executemany(
+                "DELETE FROM trade_items WHERE trade_id = ?", adopted
+            )
+            self.connection.executemany(
+                "INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?, ?)", trade_rows
+            )
+            self.connection.executemany(
+                "INSERT INTO trade_items VALUES (?, ?, ?, ?, ?)", item_rows
+            )
+
+        return len(trade_rows) + len(adopted)
+
+    # ================================= REPORTS ==================================
+
+    def sales_by_item(self, days: int) -> list[dict[str, Any]]:
+        """Items sold over the last days, with platinum earned and sales per day."""
+        rows = self.connection.execute(
+            """
+            SELECT item, SUM(quantity), SUM(trade_items.platinum)
+            FROM trades JOIN trade_items ON trade_items.trade_id = trades.id
+            WHERE traded_at >= ?
+            GROUP BY item
+            ORDER BY SUM(trade_items.platinum) DESC
+            """,
+            (time.time() - days * DAY_SECONDS,),
+        )
+
+        return [
+            {
+                "item": item,
+                "sold": sold,
+                "platinum": round(platinum),
+                "average": round(platinum / sold),
+                "per_day": sold / days,
+            }
+            for item, sold, platinum in rows
+        ]
+
+    def sales_by_day(self, days: int) -> list[dict[str, Any]]:
+        """Platinum earned per item per day over the last days, newest first."""
+        rows = self.connection.execute(
+            """
+            SELECT date(traded_at, 'unixepoch', 'localtime') AS day, item,
+                SUM(quantity), SUM(trade_items.platinum)
+            FROM trades JOIN trade_items ON trade_items.trade_id = trades.id
+            WHERE traded_at >= ?
+            GROUP BY day, item
+            ORDER BY day DESC, SUM(trade_items.platinum) DESC
+            """,
+            (time.time() - days * DAY_SECONDS,),
+        )
+
+        return [
+            {"day": day, "item": item, "sold": sold, "platinum": round(platinum)}
+            for day, item, sold, platinum in rows
+        ]
@@ -0,0 +1,132 @@
+from typing import Any
+
+from items import ItemCatalog
+
+
+class Listing:
+    """Sell order as shown by wfm, for own listings and other sellers' alike.
+
+    Own listings carry the order id and visibility. Other sellers' listings
+    carry the seller, and item listings also the seller's slug, reputation
+    and status. Fields a kind of listing doesn't have are None.
+    """
+
+    __slots__ = (
+        "id",
+        "seller",
+        "slug",
+        "reputation",
+        "status",
+        "item",
+        "item_id",
+        "price",
+        "rank",
+        "quantity",
+        "visible",
+        "updated",
+    )
+
+    def __init__(
+        self,
+        item: str,
+        item_id: str,
+        price: int,
+        rank: int | None,
+        quantity: int,
+        updated: str,
+        id: str | None = None,
+        visible: bool | None = None,
+        seller: str | None = None,
+        slug: str | None = None,
+        reputation: int | None = None,
+        status: str | None = None,
+    ) -> None:
+        self.item = item
+        self.item_id = item_id
+        self.price = price
+        self.rank = rank
+        self.quantity = quantity
+        self.updated = updated
+        self.id = id
+        self.visible = visible
+        self.seller = seller
+        self.slug = slug
+        self.reputation = reputation
+        self.status = status
+
+    def copy(self) -> "Listing":
+        return Listing(
+            self.item,
+            self.item_id,
+            self.price,
+            self.rank,
+            self.quantity,
+            self.updated,
+            self.id,
+            self.visible,
+            self.seller,
+            self.slug,
+            self.reputation,
+            self.status,
+        )
+
+
+# =================================== BUILDERS ===================================
+# Fields are passed positionally, keyword arguments cost more than the dict
+# literals these replaced on order books with thousands of orders
+
+
+def build_user_listing(order: dict[str, Any], catalog: ItemCatalog) -> Listing:
+    """Convert a raw order into one of the user's own listings."""
+    item_id = order.get("itemId", "")
+
+    return Listing(
+        catalog[item_id].name,
+        item_id,
+        order.get("platinum", 0),
+        order.get("rank"),
+        order.get("quantity", 1),
+        order.get("updatedAt", ""),
+        order.get("id", ""),
+        order.get("visible", False),
+    )
+
+
+def build_item_listing(order: dict[str, Any], catalog: ItemCatalog) -> Listing:
+    """Convert a raw order, with the user who placed it, into a seller's listing."""
+    item_id = order.get("itemId", "")
+    user = order.get("user") or {}
+
+    return Listing(
+        catalog[item_id].name,
+        item_id,
+        order.get("platinum", 0),
+        order.get("rank"),
+        order.get("quantity", 1),
+        order.get("updatedAt", ""),
+        None,
+        None,
+        user.get("ingameName", "Unknown"),
+        user.get("slug", "Unknown"),
+        user.get("reputation", 0),
+        user.get("status", "offline"),
+    )
+
+
+def build_seller_listing(
+    order: dict[str, Any], catalog: ItemCatalog, seller: str
+) -> Listing:
+    """Convert a raw order from a seller's profile into one of their listings."""
+    item_id = order.get("itemId", "")
+
+    return Listing(
+        catalog[item_id].name,
+        item_id,
+        order.get("platinum", 0),
+        order.get("rank"),
+        order.get("quantity", 1),
+        order.get("updatedAt", ""),
+        None,
+        None,
+        seller,
+    )
@@ -0,0 +1,125 @@
+import json
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+
+# Upper bucket bounds, roughly three per decade
+TIME_BUCKETS_MS = [
+    scale * 10**exponent for exponent in range(-1, 5) for scale in (1, 2, 5)
+]
+BYTE_BUCKETS = [4**exponent for exponent in range(4, 14)]  # 256 B to 64 MiB
+
+ENDPOINT_PATTERNS = [
+    (re.compile(r"^/orders/item/[^/]+$"), "/orders/item/{slug}"),
+    (re.compile(r"^/orders/user/[^/]+$"), "/orders/user/{slug}"),
+    (re.compile(r"^/order/[^/]+$"), "/order/{id}"),
+]
+
+METRICS = {
+    "dns_ms": TIME_BUCKETS_MS,
+    "connect_ms": TIME_BUCKETS_MS,
+    "ttfb_ms": TIME_BUCKETS_MS,
+    "total_ms": TIME_BUCKETS_MS,
+    "decode_ms": TIME_BUCKETS_MS,
+    "bytes": BYTE_BUCKETS,
+}
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """Group a request under its route, so per-item paths share one endpoint."""
+    for pattern, template in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return f"{method} {template}"
+
+    return f"{method} {path}"
+
+
+class Histogram:
+    """Fixed-bucket histogram, cheap enough to update on every request."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: list[float]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return 0.0
+
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": dict(zip([*map(str, self.bounds), "inf"], self.counts)),
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint histograms of request phase timings and response sizes."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, dict[str, Histogram]] = {}
+        self.errors: dict[str, int] = {}
+
+    def _histograms(self, endpoint: str) -> dict[str, Histogram]:
+        histograms = self.endpoints.get(endpoint)
+        if histograms is None:
+            histograms = self.endpoints[endpoint] = {
+                metric: Histogram(bounds) for metric, bounds in METRICS.items()
+            }
+
+        return histograms
+
+    def record(self, endpoint: str, **values: float | None) -> None:
+        histograms = self._histograms(endpoint)
+        for metric, value in values.items():
+            if value is not None:
+                histograms[metric].record(value)
+
+    def record_error(self, endpoint: str) -> None:
+        self._histograms(endpoint)
+        self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            endpoint: {
+                **{
+                    metric: histogram.to_dict()
+                    for metric, histogram in histograms.items()
+                },
+                "errors": self.errors.get(endpoint, 0),
+            }
+            for endpoint, histograms in sorted(self.endpoints.items())
+        }
+
+
+def save_stats(stats: dict[str, Any], path: Path) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    with tmp_path.open("w") as f:
+        json.dump(stats, f, indent=2)
+    tmp_path.replace(path)
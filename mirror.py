@@ -0,0 +1,63 @@
+import time
+from typing import Any
+
+from items import ItemCatalog
+from listing import Listing, build_user_listing
+
+
+class ListingMirror:
+    """Local copy of the user's own sell listings, kept current by mutations.
+
+    Every mutation sent through WFMClient is applied to the mirror from the
+    server's response, so reads only need the network when the mirror is
+    older than max_age or a response could not be applied.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self.listings: dict[str, Listing] | None = None
+        self.catalog: ItemCatalog | None = None
+        self.synced_at = 0.0
+
+    def is_stale(self) -> bool:
+        return self.listings is None or time.monotonic() - self.synced_at > self.max_age
+
+    def replace(self, listings: list[Listing], catalog: ItemCatalog) -> None:
+        """Reconcile with a full listing snapshot from the server."""
+        self.listings = {listing.id: listing for listing in listings}
+        self.catalog = catalog
+        self.synced_at = time.monotonic()
+
+    def snapshot(self) -> list[Listing]:
+        """Copies of the mirrored listings, safe for callers to modify."""
+        assert self.listings is not None
+        return [listing.copy() for listing in self.listings.values()]
+
+    def invalidate(self) -> None:
+        self.listings = None
+
+    def apply_order(self, order: Any) -> None:
+        """Insert or update a listing from an order returned by the server."""
+        if self.listings is None:
+            return
+
+        assert self.catalog is not None
+        if (
+            not isinstance(order, dict)
+            or "id" not in order
+            or order.get("type") != "sell"
+            or order.get("itemId") not in self.catalog.by_id
+        ):
+            self.invalidate()  # Can't tell what changed, reconcile on next read
+            return
+
+        self.listings[order["id"]] = build_user_listing(order, self.catalog)
+
+    def remove(self, listing_id: str) -> None:
+        if self.listings is not None:
+            self.listings.pop(listing_id, None)
+
+    def set_all_visible(self, visible: bool) -> None:
+        if self.listings is not None:
+            for listing in self.listings.values():
+                listing.visible = visible
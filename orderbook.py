@@ -0,0 +1,166 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import aiohttp
+
+from items import ItemCatalog
+from listing import Listing, build_item_listing
+from websocket import MarketSocket, WebSocketCommandError
+
+SUBSCRIBE_ROUTE = "@wfm|cmd/subscribe/newOrders"
+NEW_ORDER_ROUTE = "@wfm|event/subscriptions/newOrder"
+
+
+class OrderBook:
+    __slots__ = ("item_id", "orders", "synced_at")
+
+    def __init__(self, item_id: str, orders: dict[str, Listing]) -> None:
+        self.item_id = item_id
+        self.orders = orders
+        self.synced_at = time.monotonic()
+
+
+class LiveOrderBooks:
+    """Sell order books for watched items, kept current from WebSocket events.
+
+    Each book starts from a REST snapshot and then applies new order events
+    as they arrive. Sold or removed orders aren't pushed, so like the REST
+    cache, books older than max_age are served while resyncing in the
+    background, and books older than stale_age are resynced before serving.
+    Books are also resynced after every resubscribe since events may have
+    been missed while the socket was down.
+    """
+
+    def __init__(self, max_age: float, stale_age: float) -> None:
+        self.max_age = max_age
+        self.stale_age = stale_age
+        self.books: dict[str, OrderBook] = {}
+        self.by_item_id: dict[str, OrderBook] = {}
+        self.catalog: ItemCatalog | None = None
+        self.socket: MarketSocket | None = None
+        self.subscribed_connection = 0  # Socket connection the subscription lives on
+        self.events_applied = 0
+        self._resyncs: dict[str, asyncio.Task] = {}
+
+    def attach(self, socket: MarketSocket) -> None:
+        self.socket = socket
+        socket.on(NEW_ORDER_ROUTE, self.apply_order)
+
+    def is_live(self) -> bool:
+        return (
+            self.socket is not None
+            and self.socket.connected.is_set()
+            and self.subscribed_connection == self.socket.connection_count
+        )
+
+    async def subscribe(self) -> bool:
+        """Make sure order events are flowing, returning False if they can't be."""
+        if self.is_live():
+            return True
+
+        if self.socket is None or not self.socket.connected.is_set():
+            return False
+
+        try:
+            await self.socket.request(SUBSCRIBE_ROUTE, {})
+        except (asyncio.TimeoutError, ConnectionError, WebSocketCommandError):
+            return False
+
+        self.subscribed_connection = self.socket.connection_count
+        for book in self.books.values():
+            book.synced_at = 0.0  # May have missed events while unsubscribed
+
+        return True
+
+    def watch(
+        self,
+        slug: str,
+        item_id: str,
+        raw_orders: list[dict[str, Any]],
+        catalog: ItemCatalog,
+    ) -> None:
+        """Start or resync the book for an item from a REST snapshot."""
+        self.catalog = catalog
+        book = OrderBook(
+            item_id,
+            {
+                order["id"]: build_item_listing(order, catalog)
+                for order in raw_orders
+                if order.get("type") == "sell" and order.get("visible", True)
+            },
+        )
+        self.books[slug] = book
+        self.by_item_id[item_id] = book
+
+    def unwatch(self, slug: str) -> None:
+        book = self.books.pop(slug, None)
+        if book is not None:
+            del self.by_item_id[book.item_id]
+
+    def is_watched(self, slug: str) -> bool:
+        return slug in self.books
+
+    async def get(
+        self, slug: str, fetch: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> list[Listing]:
+        """Listings in a watched item's book, resyncing it from fetch when old."""
+        book = self.books[slug]
+        age = time.monotonic() - book.synced_at
+
+        if age >= self.stale_age:
+            assert self.catalog is not None
+            self.watch(slug, book.item_id, await fetch(), self.catalog)
+        elif age >= self.max_age and slug not in self._resyncs:
+            self._resyncs[slug] = asyncio.create_task(self._resync(slug, fetch))
+
+        return list(self.books[slug].orders.values())
+
+    def close(self) -> None:
+        """Cancel any background resyncs still running."""
+        for task in self._resyncs.values():
+            task.cancel()
+
+    async def _resync(
+        self, slug: str, fetch: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> None:
+        try:
+            raw_orders = await fetch()
+            book = self.books.get(slug)
+            if book is not None and self.catalog is not None:  # Not unwatched since
+                self.watch(slug, book.item_id, raw_orders, self.catalog)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass  # Keep serving the book until it's too stale
+        finally:
+            del self._resyncs[slug]
+
+    # ================================== EVENTS ==================================
+
+    def apply_order(self, payload: Any) -> None:
+        """Insert, update or drop an order from a new order event."""
+        order = self._event_order(payload)
+        if order is None:
+            return
+
+        book = self.by_item_id[order["itemId"]]
+        if order.get("type") == "sell" and order.get("visible", True):
+            assert self.catalog is not None
+            book.orders[order["id"]] = build_item_listing(order, self.catalog)
+        else:
+            book.orders.pop(order["id"], None)
+        self.events_applied += 1
+
+    def _event_order(self, payload: Any) -> dict[str, Any] | None:
+        """The order carried by an event, or None if it isn't for a watched item."""
+        if not isinstance(payload, dict):
+            return None
+
+        order = payload.get("order", payload)
+        if not isinstance(order, dict) or "id" not in order:
+            return None
+
+        if order.get("itemId") not in self.by_item_id:
+            return None
+
+        return order
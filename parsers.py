@@ -65,3 +65,31 @@ def parse_edit_args(args: list[str]) -> dict[str, Any]:
         kwargs[key] = value
 
     return kwargs
+
+
+# ===================================== BUMP =====================================
+
+
+def parse_bump_args(args: list[str]) -> dict[str, Any]:
+    kwargs = {}
+    pairs = zip(args[1::2], args[2::2])
+
+    for key, value in pairs:
+        kwargs[key] = value
+
+    return kwargs
+
+
+# ==================================== SALES =====================================
+
+
+def parse_sales_args(args: list[str]) -> tuple[bool, dict[str, Any]]:
+    daily = bool(args) and args[0] == "daily"
+    rest = args[1:] if daily else args
+    kwargs = {}
+    pairs = zip(rest[::2], rest[1::2])
+
+    for key, value in pairs:
+        kwargs[key] = value
+
+    return daily, kwargs
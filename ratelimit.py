@@ -0,0 +1,88 @@
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+
+from config import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_INCREASE,
+    RATE_LIMIT_MAX_PER_SECOND,
+    RATE_LIMIT_MIN_PER_SECOND,
+    RATE_LIMIT_PER_SECOND,
+)
+
+DECREASE_FACTOR = 0.5
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header in either of its formats."""
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket shared by every API request.
+
+    The refill rate adapts AIMD-style: it creeps up by RATE_LIMIT_INCREASE after
+    each successful request and halves on every 429, pausing all callers for the
+    server's Retry-After. Callers are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_SECOND,
+        min_rate: float = RATE_LIMIT_MIN_PER_SECOND,
+        max_rate: float = RATE_LIMIT_MAX_PER_SECOND,
+        burst: float = RATE_LIMIT_BURST,
+        increase: float = RATE_LIMIT_INCREASE,
+    ) -> None:
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.throttled_count = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate
+                )
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttled(self, retry_after: float | None) -> None:
+        self.throttled_count += 1
+        self.rate = max(self.min_rate, self.rate * DECREASE_FACTOR)
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+        self.tokens = 0
+        self.updated = self.paused_until  # Refill only once the pause is over
@@ -0,0 +1,218 @@
+import calendar
+import mmap
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+TRADE_START = "Are you sure you want to accept this trade?"
+TRADE_CANCEL = "SendResult_MENU_CANCEL()"
+TRADE_SUCCESS = "The trade was successful!"
+
+# First lines of every EE.log, e.g. "Current time: ... [UTC: Sat Oct 18 12:00:00 2025]"
+SESSION_START_PATTERN = re.compile(r"Current time: .*?\[UTC: ([^\]]+)\]")
+
+# Rank glyphs the game draws from the Unicode private use area
+RANK_GLYPHS = {codepoint: None for codepoint in range(0xE000, 0xF900)}
+
+
+def normalize_item_name(raw_name: str) -> str:
+    name = raw_name.split("(")[0].strip()
+    if name.isascii():
+        return name
+
+    return name.translate(RANK_GLYPHS).strip()
+
+
+def parse_session_start(text: str) -> float | None:
+    """Epoch seconds the log's session started at, from its header if present."""
+    match = SESSION_START_PATTERN.search(text)
+    if match is None:
+        return None
+
+    try:
+        return calendar.timegm(time.strptime(match[1], "%a %b %d %H:%M:%S %Y"))
+    except ValueError:
+        return None
+
+
+def _log_time(line: str) -> float | None:
+    """Seconds into the session, from the timestamp each log line starts with."""
+    try:
+        return float(line.split(" ", 1)[0])
+    except ValueError:
+        return None
+
+
+class TradeParser:
+    """Single-pass EE.log trade parser that carries its state across blocks.
+
+    Outside a trade dialog the parser jumps from one TRADE_START to the next
+    with str.find, and a dialog is cut at its first cancel or success line the
+    same way, so only dialog lines are ever split. Each of those updates the
+    offer/receive state directly and a completed trade is emitted as soon as
+    its success line is seen.
+    """
+
+    __slots__ = (
+        "recording",
+        "in_offer",
+        "in_receive",
+        "offered",
+        "received",
+        "time",
+        "dialog_start",
+    )
+
+    def __init__(self) -> None:
+        self.recording = False
+        self.in_offer = False
+        self.in_receive = False
+        self.offered: list[str] = []
+        self.received: list[str] = []
+        self.time: float | None = None
+        self.dialog_start: int | None = None  # Open dialog's line in the last block
+
+    def feed(self, text: str) -> list[dict[str, Any]]:
+        """Parse a block of complete lines, returning the trades completed in it."""
+        trades = []
+        size = len(text)
+        pos = 0
+        next_cancel = next_success = -1
+
+        while pos < size:
+            if not self.recording:
+                start = text.find(TRADE_START, pos)
+                if start == -1:
+                    break
+                pos = text.rfind("\n", pos, start) + 1 or pos
+
+            # The dialog runs until the first line that cancels or completes it
+            if next_cancel < pos:
+                next_cancel = text.find(TRADE_CANCEL, pos)
+                if next_cancel == -1:
+                    next_cancel = size
+            if next_success < pos:
+                next_success = text.find(TRADE_SUCCESS, pos)
+                if next_success == -1:
+                    next_success = size
+            end = text.find("\n", min(next_cancel, next_success))
+            end = size if end == -1 else end + 1
+
+            for line in text[pos:end].splitlines():
+                if TRADE_START in line:
+                    self._start(line)
+                    self._parse_line(line)
+                elif TRADE_CANCEL in line:
+                    self.recording = False
+                elif TRADE_SUCCESS in line and self.recording:
+                    self._parse_line(line)
+                    trades.append(self._finish())
+                elif self.recording:
+                    self._parse_line(line)
+            pos = end
+
+        self.dialog_start = None
+        if self.recording:
+            start = text.rfind(TRADE_START)
+            if start != -1:
+                self.dialog_start = text.rfind("\n", 0, start) + 1
+
+        return trades
+
+    def _start(self, line: str) -> None:
+        self.recording = True
+        self.in_offer = False
+        self.in_receive = False
+        self.offered = []
+        self.received = []
+        self.time = _log_time(line)
+
+    def _parse_line(self, line: str) -> None:
+        if "offering" in line:
+            self.in_offer = True
+        elif "receive" in line:
+            self.in_offer = False
+            self.in_receive = True
+        elif "Confirm_Item_Cancel" in line:
+            self.received.append(line.split(",")[0])
+            self.in_receive = False
+        elif self.in_offer:
+            self.offered.append(line)
+        elif self.in_receive:
+            self.received.append(line)
+
+    def _finish(self) -> dict[str, Any]:
+        self.recording = False
+
+        return {
+            "offered": tuple(
+                normalize_item_name(item) for item in self.offered if item
+            ),
+            "received": tuple(
+                normalize_item_name(item) for item in self.received if item
+            ),
+            "time": self.time,
+        }
+
+
+# ================================= BACKFILL =====================================
+
+
+def split_log(log_path: Path, split_bytes: int) -> list[tuple[int, int]]:
+    """Byte ranges of roughly split_bytes that each start at a trade dialog.
+
+    A dialog's first line resets the parser, so ranges cut there parse the
+    same on their own as they do in sequence.
+    """
+    size = log_path.stat().st_size
+    if not size:
+        return []
+
+    ranges = []
+    start = 0
+    target = split_bytes
+    marker_bytes = TRADE_START.encode()
+
+    with (
+        log_path.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as log,
+    ):
+        while target < size:
+            marker = log.find(marker_bytes, target)
+            if marker == -1:
+                break
+
+            boundary = log.rfind(b"\n", start, marker) + 1
+            if boundary > start:
+                ranges.append((start, boundary))
+                start = boundary
+                target = start + split_bytes
+            else:
+                target = marker + 1  # Dialog starts on the range's first line
+
+    ranges.append((start, size))
+
+    return ranges
+
+
+def parse_log_range(
+    log_path: Path, start: int, end: int, chunk_bytes: int
+) -> list[dict[str, Any]]:
+    """Trades in a byte range of a finished log, read in chunks of whole lines."""
+    parser = TradeParser()
+    trades = []
+    carry = b""
+
+    with log_path.open("rb") as f:
+        f.seek(start)
+        remaining = end - start
+
+        while remaining > 0 and (chunk := f.read(min(chunk_bytes, remaining))):
+            remaining -= len(chunk)
+            data = carry + chunk
+            cut = data.rfind(b"\n") + 1 if remaining else len(data)
+            carry = data[cut:]
+            trades.extend(parser.feed(data[:cut].decode("utf-8", errors="replace")))
+
+    return trades
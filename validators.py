@@ -1,5 +1,8 @@
 from typing import Any
 
+from items import ItemCatalog
+from listing import Listing
+
 # =================================== HELPERS ====================================
 
 
@@ -43,6 +46,18 @@ def convert_to_int(
     )
 
 
+def check_limit(kwargs: dict[str, Any]) -> tuple[bool, str | None]:
+    """Convert the number of listings to show to an integer of at least 1."""
+    success, error = convert_to_int(kwargs, ["limit"])
+    if not success:
+        return (False, error)
+
+    if "limit" in kwargs and kwargs["limit"] < 1:
+        return (False, "Limit must be at least 1.")
+
+    return (True, None)
+
+
 # ==================================== SEARCH ====================================
 
 
@@ -70,7 +85,7 @@ def validate_search_args(kwargs: dict[str, Any]) -> tuple[bool, str | None]:
     if "order" in kwargs and kwargs["order"] not in valid_orders:
         return (False, "Invalid order.")
 
-    return (True, None)
+    return check_limit(kwargs)
 
 
 # =================================== LISTINGS ===================================
@@ -83,15 +98,15 @@ def validate_listings_args(kwargs: dict[str, Any]) -> tuple[bool, str | None]:
         except ValueError:
             return (False, "Rank must be a number.")
 
-    return (True, None)
+    return check_limit(kwargs)
 
 
 # ==================================== SELLER ====================================
 
 
 def validate_seller_listing_selection(
-    args: list[str], current_listings: list[dict[str, Any]]
-) -> tuple[bool, str | None, dict[str, Any] | None]:
+    args: list[str], current_listings: list[Listing]
+) -> tuple[bool, str | None, Listing | None]:
     if not args or not args[0].isdigit():
         return (False, "No listing specified.", None)
 
@@ -105,10 +120,10 @@ def validate_seller_listing_selection(
 
     listing = current_listings[index]
 
-    if "id" in current_listings[index]:
+    if listing.id is not None:
         return (False, "Cannot view own listings with this command.", None)
 
-    if "reputation" not in current_listings[index]:
+    if listing.reputation is None:
         return (False, "Already viewing a seller.", None)
 
     return (True, None, listing)
@@ -130,7 +145,7 @@ def validate_seller_args(kwargs: dict[str, Any]) -> tuple[bool, str | None]:
     if "order" in kwargs and kwargs["order"] not in valid_orders:
         return (False, "Invalid order.")
 
-    return (True, None)
+    return check_limit(kwargs)
 
 
 # ===================================== ADD ======================================
@@ -154,12 +169,7 @@ def _check_missing_fields(
 
 
 def validate_add_args(
-    kwargs: dict[str, Any],
-    name_to_id: dict[str, str],
-    id_to_name: dict[str, str],
-    id_to_max_rank: dict[str, int | None],
-    id_to_tags: dict[str, set[str]],
-    id_to_bulk_tradable: dict[str, bool],
+    kwargs: dict[str, Any], catalog: ItemCatalog
 ) -> tuple[bool, str | None]:
     # Validate input fields
     success, error = check_invalid_fields(
@@ -171,20 +181,25 @@ def validate_add_args(
     # Check item name
     if "item_name" not in kwargs:
         return (False, "No item specified.")
-    elif kwargs["item_name"] not in name_to_id:
-        return (False, f"'{kwargs['item_name']}' is not a valid item.")
+
+    item = catalog.find(kwargs["item_name"])
+    if item is None:
+        suggestion = catalog.suggest(kwargs["item_name"])
+        if suggestion is None:
+            return (False, f"'{kwargs['item_name']}' is not a valid item.")
+        return (
+            False,
+            f"'{kwargs['item_name']}' is not a valid item. Did you mean '{suggestion.name}'?",
+        )
 
     # Transform item_name into item_id
-    kwargs["item_id"] = name_to_id[kwargs["item_name"]]
+    kwargs["item_id"] = item.id
     del kwargs["item_name"]
 
-    item_id = kwargs["item_id"]
-    item_name = id_to_name[item_id]
-    max_rank = id_to_max_rank[item_id]
-    item_tags = id_to_tags[item_id]
-    is_bulk_tradeable = id_to_bulk_tradable[item_id]
+    item_name = item.name
+    max_rank = item.max_rank
 
-    if "arcane_enhancement" in item_tags and is_bulk_tradeable:
+    if "arcane_enhancement" in item.tags and item.bulk_tradable:
         kwargs["per_trade"] = 1
 
     # Check for missing required fields
@@ -216,12 +231,7 @@ def validate_add_args(
 
 
 def validate_edit_args(
-    kwargs: dict[str, Any],
-    item_id: str,
-    id_to_name: dict[str, str],
-    id_to_max_rank: dict[str, int | None],
-    id_to_tags: dict[str, set[str]],
-    id_to_bulk_tradable: dict[str, bool],
+    kwargs: dict[str, Any], item_id: str, catalog: ItemCatalog
 ) -> tuple[bool, str | None]:
     # Validate input fields
     success, error = check_invalid_fields(
@@ -230,12 +240,11 @@ def validate_edit_args(
     if not success:
         return (False, error)
 
-    item_name = id_to_name[item_id]
-    max_rank = id_to_max_rank[item_id]
-    item_tags = id_to_tags[item_id]
-    is_bulk_tradeable = id_to_bulk_tradable[item_id]
+    item = catalog[item_id]
+    item_name = item.name
+    max_rank = item.max_rank
 
-    if "arcane_enhancement" in item_tags and is_bulk_tradeable:
+    if "arcane_enhancement" in item.tags and item.bulk_tradable:
         kwargs["per_trade"] = 1
 
     # Convert numeric fields
@@ -252,3 +261,39 @@ def validate_edit_args(
             return (False, f"Invalid rank for {item_name} (0-{max_rank}).")
 
     return (True, None)
+
+
+# ===================================== BUMP =====================================
+
+
+def validate_bump_args(kwargs: dict[str, Any]) -> tuple[bool, str | None]:
+    success, error = check_invalid_fields(kwargs, {"concurrency"})
+    if not success:
+        return (False, error)
+
+    success, error = convert_to_int(kwargs, ["concurrency"])
+    if not success:
+        return (False, error)
+
+    if "concurrency" in kwargs and kwargs["concurrency"] < 1:
+        return (False, "Concurrency must be at least 1.")
+
+    return (True, None)
+
+
+# ==================================== SALES =====================================
+
+
+def validate_sales_args(kwargs: dict[str, Any]) -> tuple[bool, str | None]:
+    success, error = check_invalid_fields(kwargs, {"days"})
+    if not success:
+        return (False, error)
+
+    success, error = convert_to_int(kwargs, ["days"])
+    if not success:
+        return (False, error)
+
+    if "days" in kwargs and kwargs["days"] < 1:
+        return (False, "Days must be at least 1.")
+
+    return (True, None)
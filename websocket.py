@@ -1,49 +1,197 @@
 import asyncio
 import json
+import random
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
 
 import websockets
+from prompt_toolkit.application import run_in_terminal
 
-from config import AUTH_MESSAGE, WS_URI
+from config import (
+    AUTH_MESSAGE,
+    WS_BACKOFF_BASE_SECONDS,
+    WS_BACKOFF_MAX_SECONDS,
+    WS_RESPONSE_TIMEOUT_SECONDS,
+    WS_STABLE_SECONDS,
+    WS_URI,
+)
 
+STATUS_ROUTE = "@wfm|cmd/status/set"
 
-async def open_websocket(
-    cookie_header: dict[str, str],
-    state: dict[str, str],
-    initial_status_event: asyncio.Event,
-    status_queue: asyncio.Queue,
-) -> None:
-    """Connect to WebSocket, authenticate, and manage status updates."""
-    async with websockets.connect(
-        uri=WS_URI,
-        additional_headers=cookie_header,
-    ) as ws:
-        await ws.send(AUTH_MESSAGE)
 
-        current_response_event = None
+def build_status_payload(status: str) -> dict[str, Any]:
+    return {"status": status, "duration": None}
 
-        async def send_status_updates():
-            """Send status updates from the queue to the WebSocket."""
-            nonlocal current_response_event
 
-            while True:
-                status_message, response_event = await status_queue.get()
-                await ws.send(status_message)
-                current_response_event = response_event
+class WebSocketCommandError(Exception):
+    """The server answered a WebSocket command with an error route."""
 
-        async def receive_messages():
-            """Receive messages from the WebSocket."""
-            nonlocal current_response_event
 
-            while True:
-                message = json.loads(await ws.recv())
-                payload_status = message.get("payload", {}).get("status")
+class MarketSocket:
+    """warframe.market WebSocket kept connected by a supervisor loop.
 
-                if payload_status:
-                    state["status"] = payload_status
-                    initial_status_event.set()
+    Commands are sent with an id and resolved by the response carrying it as
+    refId, so any number can be in flight at once. Every incoming message is
+    also passed to the handlers registered for its route.
+    """
 
-                    if current_response_event:
-                        current_response_event.set()
-                        current_response_event = None
+    def __init__(
+        self,
+        cookie_header: dict[str, str],
+        state: dict[str, Any],
+        initial_status_event: asyncio.Event,
+    ) -> None:
+        self.cookie_header = cookie_header
+        self.state = state
+        self.initial_status_event = initial_status_event
+        self.ws: websockets.ClientConnection | None = None
+        self.connected = asyncio.Event()
+        self.connection_count = 0
+        self.pending: dict[str, tuple[str, asyncio.Future]] = {}
+        self.handlers: dict[str, list[Callable[[dict[str, Any]], None]]] = {}
+        self.restore_task: asyncio.Task | None = None
 
-        await asyncio.gather(receive_messages(), send_status_updates())
+    def on(self, route: str, handler: Callable[[dict[str, Any]], None]) -> None:
+        """Call handler with the payload of every message received on route."""
+        self.handlers.setdefault(route, []).append(handler)
+
+    # ================================= COMMANDS =================================
+
+    async def request(
+        self,
+        route: str,
+        payload: Any,
+        timeout: float = WS_RESPONSE_TIMEOUT_SECONDS,
+    ) -> Any:
+        """Send a command and return the payload of its response.
+
+        Waits for the socket to (re)connect within the same timeout. Raises
+        TimeoutError, ConnectionError if the socket drops while waiting, or
+        WebSocketCommandError if the server rejects the command.
+        """
+        return await asyncio.wait_for(self._request(route, payload), timeout)
+
+    async def _request(self, route: str, payload: Any) -> Any:
+        await self.connected.wait()
+        assert self.ws is not None
+
+        request_id = str(uuid.uuid4())
+        response = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = (route, response)
+        try:
+            await self.ws.send(
+                json.dumps({"route": route, "payload": payload, "id": request_id})
+            )
+            return await response
+        except websockets.ConnectionClosed as e:
+            raise ConnectionError("WebSocket closed") from e
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def set_status(self, status: str) -> Any:
+        # Restored after a reconnect even if this request fails
+        self.state["requested"] = status
+
+        return await self.request(STATUS_ROUTE, build_status_payload(status))
+
+    async def _restore_status(self) -> None:
+        """Restore the status last asked for before a reconnect."""
+        try:
+            await self.request(
+                STATUS_ROUTE, build_status_payload(self.state["requested"])
+            )
+        except (asyncio.TimeoutError, ConnectionError, WebSocketCommandError):
+            pass  # Restored again on the next reconnect
+
+    # ================================= DISPATCH =================================
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        route = message.get("route", "")
+        payload = message.get("payload")
+        base_route, _, outcome = route.partition(":")
+
+        if outcome in ("ok", "error"):
+            pending = self.pending.get(message.get("refId", ""))
+            if pending is None:
+                # No refId echoed, fall back to the oldest command on the route
+                pending = next(
+                    (p for p in self.pending.values() if p[0] == base_route), None
+                )
+
+            if pending is not None and not pending[1].done():
+                if outcome == "ok":
+                    pending[1].set_result(payload)
+                else:
+                    pending[1].set_exception(WebSocketCommandError(payload))
+
+        if isinstance(payload, dict) and payload.get("status"):
+            self._on_status(payload)
+
+        for handler in self.handlers.get(base_route, ()):
+            try:
+                handler(payload)
+            except Exception as e:
+                # A bad event must not drop the connection or the other handlers
+                run_in_terminal(
+                    lambda e=e: print(f"\nFailed to handle {base_route} ({e!r}).\n")
+                )
+
+    def _on_status(self, payload: dict[str, Any]) -> None:
+        self.state["status"] = payload["status"]
+        self.state["connected"] = True
+        self.initial_status_event.set()
+
+    def _fail_pending(self) -> None:
+        for _, response in self.pending.values():
+            if not response.done():
+                response.set_exception(ConnectionError("WebSocket closed"))
+
+    # ================================ CONNECTION ================================
+
+    async def _connect(self) -> None:
+        """Connect, authenticate and dispatch messages until the connection drops."""
+        async with websockets.connect(
+            uri=WS_URI,
+            additional_headers=self.cookie_header,
+        ) as ws:
+            await ws.send(AUTH_MESSAGE)
+
+            self.ws = ws
+            self.connection_count += 1
+            self.connected.set()
+
+            # Sent as a command so its reply can't resolve another status command
+            if "requested" in self.state:
+                self.restore_task = asyncio.create_task(self._restore_status())
+            try:
+                async for message in ws:
+                    self._dispatch(json.loads(message))
+            finally:
+                self.connected.clear()
+                self.state["connected"] = False
+                self.ws = None
+                self._fail_pending()
+
+    async def run(self) -> None:
+        """Keep the WebSocket connected, reconnecting with jittered exponential backoff."""
+        attempt = 0
+
+        while True:
+            connected_at = time.monotonic()
+            try:
+                await self._connect()
+            except (websockets.WebSocketException, OSError, ValueError):
+                pass  # Dropped or refused, reconnect below
+            except Exception as e:
+                run_in_terminal(
+                    lambda e=e: print(f"\nWebSocket failed, reconnecting ({e!r}).\n")
+                )
+
+            if time.monotonic() - connected_at > WS_STABLE_SECONDS:
+                attempt = 0
+
+            backoff = min(WS_BACKOFF_MAX_SECONDS, WS_BACKOFF_BASE_SECONDS * 2**attempt)
+            attempt += 1
+            await asyncio.sleep(random.uniform(0, backoff))
@@ -3,86 +3,85 @@
 # ================================================================================
 
 import asyncio
-import json
 import shlex
 import sys
-from typing import Any
+from pathlib import Path
 
 import aiohttp
 from prompt_toolkit import ANSI, PromptSession
 from prompt_toolkit.history import FileHistory
 
-from api import (
-    add_listing,
-    change_all_visibility,
-    change_visibility,
-    delete_listing,
-    edit_listing,
-    extract_user_listings,
-    get_all_items,
-    get_user_info,
-)
+from api import WFMClient
 from auth import (
     COOKIES_FILE,
-    build_authenticated_headers,
     build_cookie_header,
     ensure_app_dir,
     ensure_cookies_file,
     load_cookies,
     prompt_for_cookies,
 )
-from commands import copy, links, listings, search, seller, sync
-from config import APP_DIR, HISTORY_FILE
-from display import DEFAULT_ORDERS, clear_screen, display_help, display_profile
-from filters import sort_listings
+from catalog import catalog_age, fetch_catalog, load_catalog
+from commands import (
+    backfill,
+    bump_all,
+    copy,
+    discard_sync,
+    follow,
+    links,
+    listings,
+    report_follow_end,
+    resume_sync,
+    sales,
+    search,
+    seller,
+    sync,
+    unwatch,
+    watch,
+)
+from completer import build_completer
+from config import (
+    APP_DIR,
+    HISTORY_FILE,
+    LEDGER_FILE,
+    STATS_FILE,
+    WS_RESPONSE_TIMEOUT_SECONDS,
+)
+from display import (
+    clear_screen,
+    display_catalog_status,
+    display_help,
+    display_profile,
+    display_stats,
+)
+from ledger import TradeLedger
+from metrics import save_stats
 from parsers import (
     parse_add_args,
+    parse_bump_args,
     parse_edit_args,
     parse_listings_args,
+    parse_sales_args,
     parse_search_args,
     parse_seller_args,
 )
 from validators import (
     validate_add_args,
+    validate_bump_args,
     validate_edit_args,
     validate_listings_args,
+    validate_sales_args,
     validate_search_args,
     validate_seller_args,
     validate_seller_listing_selection,
 )
-from websocket import open_websocket
+from websocket import MarketSocket, WebSocketCommandError
 
 STATUS_MAPPING = {
     "ingame": "\033[32mIn Game\033[0m",  # Green
     "online": "\033[34mOnline\033[0m",  # Blue
     "invisible": "\033[2mInvisible\033[0m",  # Grey
 }
-
-
-def build_id_to_name_mapping(all_items: list[dict[str, Any]]) -> dict[str, str]:
-    return {item["id"]: item["i18n"]["en"]["name"] for item in all_items}
-
-
-def build_id_to_tags_mapping(all_items: list[dict[str, Any]]) -> dict[str, set[str]]:
-    return {item["id"]: set(item["tags"]) for item in all_items}
-
-
-def build_id_to_bulkTradable_mapping(
-    all_items: list[dict[str, Any]],
-) -> dict[str, bool]:
-    return {item["id"]: item.get("bulkTradable", False) for item in all_items}
-
-
-def build_id_to_max_rank_mapping(
-    all_items: list[dict[str, Any]],
-) -> dict[str, int | None]:
-    return {item["id"]: item.get("maxRank") for item in all_items}
-
-
-def build_id_to_slug_mapping(
-    all_items: list[dict[str, Any]],
-) -> dict[str, str]:
-    return {item["id"]: item["slug"] for item in all_items}
+DISCONNECTED_STATUS = "\033[31mReconnecting\033[0m"  # Red
 
 
 async def wfm() -> None:
@@ -106,31 +105,24 @@ async def wfm() -> None:
 
     cookies = load_cookies()
 
-    async with aiohttp.ClientSession() as session:
+    async with WFMClient() as client:
+        catalog_task = asyncio.create_task(load_catalog(client))
+
         for attempt in range(4):
             cookie_header = build_cookie_header(cookies)
-            authenticated_headers = build_authenticated_headers(cookie_header)
+            client.set_cookies(cookie_header)
 
             initial_status_event = asyncio.Event()
-            status_queue = asyncio.Queue()
-            status_state = {"status": "invisible"}
-
-            websocket_task = asyncio.create_task(
-                open_websocket(
-                    cookie_header,
-                    status_state,
-                    initial_status_event,
-                    status_queue,
-                )
+            status_state = {"status": "invisible", "connected": False}
+
+            market_socket = MarketSocket(
+                cookie_header, status_state, initial_status_event
             )
+            client.live_books.attach(market_socket)
+            websocket_task = asyncio.create_task(market_socket.run())
 
             try:
-                user_info, all_items = await asyncio.gather(
-                    get_user_info(session, authenticated_headers),
-                    get_all_items(session),
-                )
-
-                await initial_status_event.wait()
+                user_info = await client.get_user_info()
                 break  # Success
 
             except (ValueError, aiohttp.ClientResponseError):
@@ -145,25 +137,52 @@ async def wfm() -> None:
                 print()
                 ensure_cookies_file(cookies)
 
-        id_to_name = build_id_to_name_mapping(all_items)
-        id_to_tags = build_id_to_tags_mapping(all_items)
-        id_to_bulk_tradable = build_id_to_bulkTradable_mapping(all_items)
-        id_to_max_rank = build_id_to_max_rank_mapping(all_items)
-        id_to_slug = build_id_to_slug_mapping(all_items)
+        try:
+            await asyncio.wait_for(
+                initial_status_event.wait(), WS_RESPONSE_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            print("WebSocket unavailable, reconnecting in the background.\n")
 
-        name_to_id = {v.lower(): k for k, v in id_to_name.items()}
+        catalog_cache, refresh_task = await catalog_task
+        catalog = catalog_cache["catalog"]
 
-        prompt_session = PromptSession(history=FileHistory(HISTORY_FILE))
+        prompt_session = PromptSession(
+            history=FileHistory(HISTORY_FILE),
+            completer=build_completer(lambda: catalog),
+        )
+
+        ledger = TradeLedger(LEDGER_FILE)
+        success, error = await resume_sync(client, ledger)
+        if not success:
+            print(f"\n{error} Run 'sync' to retry.\n")
 
         current_listings = []
+        follow_task = None
 
         while True:
+            if follow_task is not None and follow_task.done():
+                follow_task = None  # Failures are reported by report_follow_end
+
+            if refresh_task is not None and refresh_task.done():
+                if not refresh_task.cancelled() and refresh_task.exception() is None:
+                    catalog_cache, _ = refresh_task.result()
+                    catalog = catalog_cache["catalog"]
+                refresh_task = None
+
             try:
-                cmd = await prompt_session.prompt_async(
-                    ANSI(f"wfm [{STATUS_MAPPING[status_state['status']]}]> ")
+                status_label = (
+                    STATUS_MAPPING[status_state["status"]]
+                    if status_state["connected"]
+                    else DISCONNECTED_STATUS
                 )
+                cmd = await prompt_session.prompt_async(ANSI(f"wfm [{status_label}]> "))
             except (KeyboardInterrupt, EOFError):
                 websocket_task.cancel()
+                if refresh_task is not None:
+                    refresh_task.cancel()
+                if follow_task is not None:
+                    follow_task.cancel()
                 break
 
             parts = shlex.split(cmd)
@@ -187,26 +206,33 @@ async def wfm() -> None:
                     if not success:
                         print(f"\n{error}\n")
                         continue
-                    item_id = current_listings[listing_index]["itemId"]
-                    item_slug = id_to_slug[item_id]
+                    item_id = current_listings[listing_index].item_id
+                    item_slug = catalog[item_id].slug
                 else:
                     item, kwargs = parse_search_args(args)
                     success, error = validate_search_args(kwargs)
                     if not success:
                         print(f"\n{error}\n")
                         continue
-                    if item.lower() not in name_to_id:
-                        print(f"\nItem '{item}' not found.\n")
+                    found_item = catalog.find(item)
+                    if found_item is None:
+                        suggestion = catalog.suggest(item)
+                        if suggestion is None:
+                            print(f"\nItem '{item}' not found.\n")
+                        else:
+                            print(
+                                f"\nItem '{item}' not found. Did you mean '{suggestion.name}'?\n"
+                            )
                         continue
-                    item_id = name_to_id[item]
-                    item_slug = id_to_slug[item_id]
+                    item_slug = found_item.slug
 
                 success, error, current_listings = await search(
-                    item_slug, id_to_name, id_to_max_rank, session, **kwargs
+                    item_slug, catalog, client, **kwargs
                 )
 
             elif action == "listings":
-                kwargs = parse_listings_args(args)
+                refresh = bool(args) and args[0] == "refresh"
+                kwargs = parse_listings_args(args[1:] if refresh else args)
 
                 success, error = validate_listings_args(kwargs)
                 if not success:
@@ -214,11 +240,10 @@ async def wfm() -> None:
                     continue
 
                 success, error, current_listings = await listings(
-                    id_to_name,
-                    id_to_max_rank,
+                    catalog,
                     user_info["slug"],
-                    authenticated_headers,
-                    session,
+                    client,
+                    refresh,
                     **kwargs,
                 )
 
@@ -242,15 +267,14 @@ async def wfm() -> None:
                     print(f"\n{error}\n")
                     continue
 
-                seller_slug = listing["slug"]
-                seller_name = listing["seller"]
+                seller_slug = listing.slug
+                seller_name = listing.seller
 
                 success, error, current_listings = await seller(
-                    id_to_name,
-                    id_to_max_rank,
+                    catalog,
                     seller_slug,
                     seller_name,
-                    session,
+                    client,
                     **kwargs,
                 )
 
@@ -261,22 +285,15 @@ async def wfm() -> None:
             elif action == "add":
                 kwargs = parse_add_args(args)
 
-                success, error = validate_add_args(
-                    kwargs,
-                    name_to_id,
-                    id_to_name,
-                    id_to_max_rank,
-                    id_to_tags,
-                    id_to_bulk_tradable,
-                )
+                success, error = validate_add_args(kwargs, catalog)
 
                 if not success:
                     print(f"\n{error}\n")
                     continue
 
-                await add_listing(session, authenticated_headers, **kwargs)
+                await client.add_listing(**kwargs)
 
-                item_name = id_to_name[kwargs["item_id"]]
+                item_name = catalog[kwargs["item_id"]].name
                 print(f"\n{item_name} listing added.\n")
 
             elif action == "show":
@@ -290,7 +307,7 @@ async def wfm() -> None:
                     print("\nInvalid listing specifier.\n")
                     continue
                 if args[0] == "all":
-                    await change_all_visibility(session, True, authenticated_headers)
+                    await client.change_all_visibility(True)
                     print("\nAll listings visible.\n")
                     continue
                 listing_index = int(args[0]) - 1
@@ -298,14 +315,12 @@ async def wfm() -> None:
                     print("\nInvalid listing number.\n")
                     continue
                 listing = current_listings[listing_index]
-                if "id" not in listing:
+                if listing.id is None:
                     print("\nCannot modify other users' listings.\n")
                     continue
-                listing_id = listing["id"]
-                item = listing["item"]
-                await change_visibility(
-                    session, listing_id, True, authenticated_headers
-                )
+                listing_id = listing.id
+                item = listing.item
+                await client.change_visibility(listing_id, True)
                 print(f"\n{item} listing visible.\n")
 
             elif action == "hide":
@@ -316,7 +331,7 @@ async def wfm() -> None:
                     print("\nNo listings available.\n")
                     continue
                 if args[0] == "all":
-                    await change_all_visibility(session, False, authenticated_headers)
+                    await client.change_all_visibility(False)
                     print("\nAll listings hidden.\n")
                 elif args[0].isdigit():
                     listing_index = int(args[0]) - 1
@@ -324,14 +339,12 @@ async def wfm() -> None:
                         print("\nInvalid listing number.\n")
                         continue
                     listing = current_listings[listing_index]
-                    if "id" not in listing:
+                    if listing.id is None:
                         print("\nCannot modify other users' listings.\n")
                         continue
-                    listing_id = listing["id"]
-                    item = listing["item"]
-                    await change_visibility(
-                        session, listing_id, False, authenticated_headers
-                    )
+                    listing_id = listing.id
+                    item = listing.item
+                    await client.change_visibility(listing_id, False)
                     print(f"\n{item} listing hidden.\n")
 
                 else:
@@ -353,12 +366,12 @@ async def wfm() -> None:
                     print("\nInvalid listing number.\n")
                     continue
                 listing = current_listings[listing_index]
-                if "id" not in listing:
+                if listing.id is None:
                     print("\nCannot modify other users' listings.\n")
                     continue
-                listing_id = listing["id"]
-                item = listing["item"]
-                await delete_listing(session, listing_id, authenticated_headers)
+                listing_id = listing.id
+                item = listing.item
+                await client.delete_listing(listing_id)
                 print(f"\nDeleted {item} listing.\n")
 
             elif action == "edit":
@@ -380,32 +393,23 @@ async def wfm() -> None:
 
                 listing = current_listings[listing_index]
 
-                if "id" not in listing:
+                if listing.id is None:
                     print("\nCannot modify other users' listings.\n")
                     continue
 
-                success, error = validate_edit_args(
-                    kwargs,
-                    listing["itemId"],
-                    id_to_name,
-                    id_to_max_rank,
-                    id_to_tags,
-                    id_to_bulk_tradable,
-                )
+                success, error = validate_edit_args(kwargs, listing.item_id, catalog)
                 if not success:
                     print(f"\n{error}\n")
                     continue
 
                 for field in ["price", "quantity", "rank", "visible"]:
-                    kwargs.setdefault(field, listing[field])
+                    kwargs.setdefault(field, getattr(listing, field))
 
-                await edit_listing(
-                    session,
-                    authenticated_headers,
-                    listing["id"],
+                await client.edit_listing(
+                    listing.id,
                     **kwargs,
                 )
-                print(f"\nUpdated {listing['item']} listing.\n")
+                print(f"\nUpdated {listing.item} listing.\n")
 
             elif action == "bump":
                 if not args:
@@ -421,51 +425,37 @@ async def wfm() -> None:
                         continue
                     listing = current_listings[listing_index]
 
-                    if "id" not in listing:
+                    if listing.id is None:
                         print("\nCannot bump other users' listings.\n")
                         continue
 
                     fields = ["price", "quantity", "rank", "visible"]
                     kwargs = {
-                        field: listing[field]
+                        field: getattr(listing, field)
                         for field in fields
-                        if listing[field] is not None
+                        if getattr(listing, field) is not None
                     }
 
-                    await edit_listing(
-                        session,
-                        authenticated_headers,
-                        listing["id"],
+                    await client.edit_listing(
+                        listing.id,
                         **kwargs,
                     )
-                    print(f"\nBumped {listing['item']} listing.")
+                    print(f"\nBumped {listing.item} listing.")
                 elif args[0] == "all":
-                    user_listings = await extract_user_listings(
-                        session, user_info["slug"], id_to_name, authenticated_headers
-                    )
-                    if not user_listings:
-                        print("\nNo listings available.\n")
+                    kwargs = parse_bump_args(args)
+
+                    success, error = validate_bump_args(kwargs)
+                    if not success:
+                        print(f"\n{error}\n")
                         continue
-                    print("\nBumping all listings...\n")
-                    sorted_listings, _ = sort_listings(
-                        user_listings, "updated", "asc", DEFAULT_ORDERS
+
+                    success, error = await bump_all(
+                        catalog, user_info["slug"], client, **kwargs
                     )
-                    for listing in sorted_listings:
-                        fields = ["price", "quantity", "rank", "visible"]
-                        kwargs = {
-                            field: listing[field]
-                            for field in fields
-                            if listing[field] is not None
-                        }
-
-                        await edit_listing(
-                            session,
-                            authenticated_headers,
-                            listing["id"],
-                            **kwargs,
-                        )
-                        print(f"Bumped {listing['item']} listing.")
-                        await asyncio.sleep(0.5)  # Rate limit
+
+                    if not success:
+                        print(f"\n{error}\n")
+                        continue
 
                 else:
                     print("\nInvalid listing specifier.\n")
@@ -484,20 +474,18 @@ async def wfm() -> None:
                 if not (0 <= listing_index < len(current_listings)):
                     print("\nInvalid listing number.\n")
                     continue
-                if "id" in current_listings[listing_index]:
+                if current_listings[listing_index].id is not None:
                     print("\nCannot copy own listings.\n")
                     continue
                 listing = current_listings[listing_index]
-                message = copy(listing, id_to_max_rank)
+                message = copy(listing, catalog)
                 print(f"\nCopied to clipboard: {message}\n")
 
             elif action == "links":
                 success, error = await links(
-                    all_items,
-                    id_to_name,
+                    catalog,
                     user_info["slug"],
-                    authenticated_headers,
-                    session,
+                    client,
                     prompt_session,
                 )
 
@@ -513,30 +501,135 @@ async def wfm() -> None:
                     print(f"\n'{args[0]}' is not a valid status.\n")
                     continue
 
-                error = {
-                    "route": "@wfm|cmd/status/set",
-                    "payload": {"status": args[0], "duration": None},
-                }
-                status_response_event = asyncio.Event()
-                await status_queue.put((json.dumps(error), status_response_event))
-                await status_response_event.wait()
+                try:
+                    await market_socket.set_status(args[0])
+                except (asyncio.TimeoutError, ConnectionError, WebSocketCommandError):
+                    print("\nStatus change not confirmed.\n")
+                    continue
                 print()
 
             elif action == "sync":
+                if args and args[0] == "follow":
+                    if follow_task is not None and not follow_task.done():
+                        print("\nAlready following EE.log.\n")
+                        continue
+                    follow_task = asyncio.create_task(
+                        follow(lambda: catalog, user_info["slug"], client, ledger)
+                    )
+                    follow_task.add_done_callback(report_follow_end)
+                    print("\nFollowing EE.log, listings sync as trades complete.\n")
+                    continue
+
+                if args and args[0] == "stop":
+                    if follow_task is None or follow_task.done():
+                        print("\nNot following EE.log.\n")
+                        continue
+                    follow_task.cancel()
+                    follow_task = None
+                    print("\nStopped following EE.log.\n")
+                    continue
+
+                if args and args[0] == "discard":
+                    success, error = await discard_sync(ledger)
+                    if not success:
+                        print(f"\n{error}\n")
+                    continue
+
+                if args and args[0] == "backfill":
+                    if len(args) < 2:
+                        print("\nNo log files specified.\n")
+                        continue
+                    success, error = await backfill(args[1:], ledger)
+                    if not success:
+                        print(f"\n{error}\n")
+                    continue
+
+                if args:
+                    print(f"\n'{args[0]}' is not a valid sync action.\n")
+                    continue
+
                 success, error = await sync(
-                    id_to_name,
+                    catalog,
                     user_info["slug"],
-                    session,
-                    authenticated_headers,
+                    client,
+                    ledger,
                 )
 
                 if not success:
                     print(f"\n{error}\n")
 
+            elif action == "sales":
+                daily, kwargs = parse_sales_args(args)
+                success, error = validate_sales_args(kwargs)
+                if not success:
+                    print(f"\n{error}\n")
+                    continue
+
+                success, error = sales(ledger, daily, **kwargs)
+
+                if not success:
+                    print(f"\n{error}\n")
+
+            elif action == "catalog":
+                if not args:
+                    display_catalog_status(len(catalog), catalog_age(catalog_cache))
+                    continue
+
+                if args[0] != "refresh":
+                    print(f"\n'{args[0]}' is not a valid catalog action.\n")
+                    continue
+
+                if refresh_task is not None:
+                    refresh_task.cancel()
+                    refresh_task = None
+
+                try:
+                    catalog_cache, changed = await fetch_catalog(client, catalog_cache)
+                except aiohttp.ClientError:
+                    print("\nCatalog refresh failed.\n")
+                    continue
+
+                if not changed:
+                    print("\nCatalog already up to date.\n")
+                    continue
+
+                catalog = catalog_cache["catalog"]
+                print(f"\nCatalog refreshed ({len(catalog)} items).\n")
+
             elif action == "profile":
-                user_info = await get_user_info(session, authenticated_headers)
+                user_info = await client.get_user_info()
                 display_profile(user_info)
 
+            elif action in ("watch", "unwatch"):
+                if not args:
+                    if action == "unwatch":
+                        print("\nNo item specified.\n")
+                        continue
+                    found_item = None
+                else:
+                    found_item = catalog.find(args[0])
+                    if found_item is None:
+                        suggestion = catalog.suggest(args[0])
+                        if suggestion is None:
+                            print(f"\nItem '{args[0]}' not found.\n")
+                        else:
+                            print(
+                                f"\nItem '{args[0]}' not found. Did you mean '{suggestion.name}'?\n"
+                            )
+                        continue
+
+                if action == "watch":
+                    success, error = await watch(found_item, catalog, client)
+                else:
+                    assert found_item is not None
+                    success, error = unwatch(found_item, client)
+
+                if not success:
+                    print(f"\n{error}\n")
+
+            elif action == "stats":
+                display_stats(client.stats())
+
             elif action == "clear":
                 clear_screen()
 
@@ -545,11 +638,20 @@ async def wfm() -> None:
 
             elif action == "exit" or action == "quit":
                 websocket_task.cancel()
+                if refresh_task is not None:
+                    refresh_task.cancel()
+                if follow_task is not None:
+                    follow_task.cancel()
                 break
 
             else:
                 print(f"\n'{action}' is not a valid command. See 'help'.\n")
 
+        ledger.close()
+
+        if STATS_FILE is not None:
+            save_stats(client.stats(), Path(STATS_FILE))
+
 
 if __name__ == "__main__":
     asyncio.run(wfm())